@@ -0,0 +1,48 @@
+"""
+Display width of Japanese product titles and their words: unicodedata.east_asian_width
+per character (previous implementation) versus the lookup-table engine.
+
+    python -m benchmarks.bench_display_width
+"""
+import time
+import unicodedata
+
+from utils.display_width import get_display_width, get_display_widths
+
+TITLE = "【SALE】送料無料 Tシャツ メンズ レディース cotton 100% XL ギフト プレゼント おしゃれ 人気 ランキング 【公式】"
+
+
+def legacy_get_display_width(text: str) -> int:
+    width = 0
+    for char in text:
+        if unicodedata.east_asian_width(char) in ('F', 'W', 'A'):
+            width += 2
+        else:
+            width += 1
+    return width
+
+
+def measure(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:.3f}s")
+    return result, elapsed
+
+
+def main():
+    titles = [f"{TITLE} {i}" for i in range(50_000)]
+    words = [word for title in titles[:10_000] for word in title.split(' ')]
+    get_display_width("あ")  # 查表在第一次使用時建立，不計入
+
+    for name, texts in (("titles", titles), ("words", words)):
+        print(f"{len(texts)} {name}")
+        expected, legacy_time = measure("  east_asian_width", lambda: [legacy_get_display_width(t) for t in texts])
+        actual, table_time = measure("  get_display_width", lambda: [get_display_width(t) for t in texts])
+        batch, batch_time = measure("  get_display_widths", lambda: get_display_widths(texts))
+        assert actual == batch == expected
+        print(f"  speedup: {legacy_time / table_time:.1f}x (batch {legacy_time / batch_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
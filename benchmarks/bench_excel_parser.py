@@ -0,0 +1,64 @@
+"""
+Parsing a vendor copywriting workbook with 150 product sheets: pandas (read_excel per sheet)
+versus the single-pass openpyxl read-only streaming reader.
+
+    python -m benchmarks.bench_excel_parser
+"""
+import time
+import tracemalloc
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from handlers.excel_parser import ProductExcelParser
+
+
+def make_sheet_rows(n: int) -> list:
+    rows = [["「商品詳細介紹」<圖片含文字>"]]
+    rows += [[f"{n}_{i:02d}.jpg", None, f"圖片說明 {i}" * 5, f"https://example.com/{n}/{i}"] for i in range(15)]
+    rows += [[None], ["「商品詳細介紹」<圖片無文字>"]]
+    rows += [[None, None, f"商品說明第 {i} 段。" * 10] for i in range(20)]
+    rows += [["「商品簡短介紹」<一段100字以內文字>"], [None, None, "簡短介紹" * 10]]
+    rows += [["「商品5大賣點」<每項一段文字即可>"]] + [[str(i), None, f"賣點 {i}"] for i in range(5)]
+    rows += [["「商品詳細資訊」"]] + [[f"規格 {i}", None, f"值 {i}"] for i in range(30)]
+    return rows
+
+
+def make_workbook_bytes(sheet_count: int) -> bytes:
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for n in range(sheet_count):
+        sheet = workbook.create_sheet(f"商品{n}文案")
+        for row in make_sheet_rows(n):
+            sheet.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(label, excel_bytes, streaming):
+    start = time.perf_counter()
+    result = ProductExcelParser("shop-bench", excel_bytes, streaming=streaming).parse_all_sheets()
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc 會拖慢執行，記憶體另外量
+    tracemalloc.start()
+    ProductExcelParser("shop-bench", excel_bytes, streaming=streaming).parse_all_sheets()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<20} {elapsed:.3f}s  peak {peak / 1024 / 1024:.1f} MiB")
+    return result, elapsed
+
+
+def main():
+    sheet_count = 150
+    excel_bytes = make_workbook_bytes(sheet_count)
+    print(f"{sheet_count} sheets, {len(excel_bytes) / 1024:.0f} KiB")
+    expected, pandas_time = measure("  pandas", excel_bytes, streaming=False)
+    actual, streaming_time = measure("  streaming", excel_bytes, streaming=True)
+    assert actual == expected
+    print(f"  speedup: {pandas_time / streaming_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
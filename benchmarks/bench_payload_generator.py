@@ -0,0 +1,57 @@
+"""
+Applying one campaign format to 100k items: re-splitting and re-formatting the format
+string for every item (previous implementation) versus the compiled template.
+
+    python -m benchmarks.bench_payload_generator
+"""
+import re
+import time
+
+from handlers.payload_generator import BaseContentGenerator
+
+ITEM_COUNT = 100_000
+HTML_FORMAT = "<div class='campaign'><p>ポイント{point_rate}倍 {campaign_code}</p>{original_html}</div>"
+
+
+def legacy_apply_format_if_needed(original_content, format_string, placeholder, **kwargs):
+    parts = re.split(re.escape(placeholder), format_string)
+    prefix_template = parts[0]
+    suffix_template = parts[1] if len(parts) > 1 else ""
+
+    temp_kwargs = {k: v for k, v in kwargs.items() if k != placeholder.strip("{}")}
+
+    actual_prefix = prefix_template.format(**temp_kwargs)
+    actual_suffix = suffix_template.format(**temp_kwargs)
+
+    if original_content.startswith(actual_prefix) and original_content.endswith(actual_suffix):
+        return original_content
+    return format_string.format(original_title=original_content, original_html=original_content, **kwargs)
+
+
+def main():
+    contents = [f"<p>商品説明 {i}</p>" * 20 for i in range(ITEM_COUNT)]
+    # 點數倍率只有幾種，對應實際活動中少數幾組不同的 kwargs
+    kwargs_list = [{"point_rate": (5, 10, 20)[i % 3], "campaign_code": "SS2025"} for i in range(ITEM_COUNT)]
+
+    start = time.perf_counter()
+    expected = [
+        legacy_apply_format_if_needed(content, HTML_FORMAT, "{original_html}", **kwargs)
+        for content, kwargs in zip(contents, kwargs_list)
+    ]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [
+        BaseContentGenerator._apply_format_if_needed(content, HTML_FORMAT, "{original_html}", **kwargs)
+        for content, kwargs in zip(contents, kwargs_list)
+    ]
+    compiled_time = time.perf_counter() - start
+
+    assert actual == expected
+    print(f"legacy   {ITEM_COUNT} items in {legacy_time:.3f}s")
+    print(f"compiled {ITEM_COUNT} items in {compiled_time:.3f}s")
+    print(f"speedup: {legacy_time / compiled_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Parsing a whole-catalog bulk-get response: ProductData.from_api versus CampaignProductData,
+the slim model used by CampaignUpdateFlow.
+
+    python -m benchmarks.bench_product_parsing
+"""
+import time
+import tracemalloc
+
+from models.item import CampaignProductData, ProductData
+
+
+def make_api_item(i: int) -> dict:
+    return {
+        "manageNumber": f"item-{i}",
+        "itemNumber": f"no-{i}",
+        "title": f"【送料無料】テスト商品 Tシャツ メンズ レディース {i}",
+        "productDescription": {"pc": "<p>商品説明</p>" * 20, "sp": "<p>商品説明</p>" * 20},
+        "salesDescription": "<p>販売説明</p>" * 10,
+        "images": [{"type": "CABINET", "location": f"/images/{i}_{n}.jpg", "alt": f"image {n}"} for n in range(10)],
+        "genreId": "100371",
+        "tags": [1000 + n for n in range(5)],
+        "variants": {
+            f"v{n}": {"standardPrice": str(1000 + n),
+                      "referencePrice": {"displayType": "REFERENCE_PRICE", "type": 1, "value": "1999"}}
+            for n in range(5)
+        },
+        "customizationOptions": [
+            {"displayName": "ラッピング", "inputType": "SINGLE_SELECTION",
+             "selections": [{"displayValue": f"選択肢 {n}"} for n in range(10)]},
+        ],
+        "pointCampaign": {"applicablePeriod": {"start": "2025-10-24T20:00:00+09:00",
+                                               "end": "2025-10-27T09:59:59+09:00"},
+                          "benefits": {"pointRate": 5}},
+        "hideItem": False,
+    }
+
+
+def measure(label, parse_all, count):
+    raw_items = [make_api_item(i) for i in range(count)]
+    start = time.perf_counter()
+    parse_all(raw_items)
+    elapsed = time.perf_counter() - start
+    del raw_items
+
+    # 模擬逐頁取得：原始 dict 解析完就不再被呼叫端持有，只計算解析結果保留的記憶體
+    tracemalloc.start()
+    result = parse_all([make_api_item(i) for i in range(count)])
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    print(f"{label:<22} {elapsed:.3f}s  {retained / 1024 / 1024:.1f} MiB retained")
+    return elapsed
+
+
+def main():
+    sample = [make_api_item(i) for i in range(100)]
+    fields = set(CampaignProductData.model_fields)
+    assert [CampaignProductData.from_api(item).model_dump() for item in sample] == [
+        ProductData.from_api(item).model_dump(include=fields) for item in sample
+    ]
+
+    count = 10_000
+    print(f"{count} items")
+    full_time = measure("  from_api", lambda items: [ProductData.from_api(item) for item in items], count)
+    projected_time = measure(
+        "  CampaignProductData", lambda items: [CampaignProductData.from_api(item) for item in items], count
+    )
+    print(f"  speedup: CampaignProductData {full_time / projected_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Compares bare requests calls with the pooled RMSClient against a local stand-in server.
+
+    python -m benchmarks.bench_rms_client
+"""
+import time
+
+import requests
+
+from benchmarks.stub_server import StubRMSServer
+from handlers.rate_limiter import RateLimiter
+from handlers.rms_client import RMSClient
+
+CALLS = 300
+
+
+def bench(label: str, func) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func().raise_for_status()
+    per_call_ms = (time.perf_counter() - start) / CALLS * 1000
+    print(f"{label:<24} {per_call_ms:.2f} ms/call")
+    return per_call_ms
+
+
+def main():
+    with StubRMSServer(latency=0) as server:
+        url = f"{server.url}/es/2.0/items/manage-numbers/item-1"
+        headers = {"Authorization": "Bearer token", "Content-Type": "application/json"}
+
+        bare = bench("requests.get (no pool)", lambda: requests.get(url, headers=headers))
+        # 本機測試不套用 RMS 的流量限制
+        client = RMSClient("token", rate_limiter=RateLimiter(default_rate=100_000))
+        pooled = bench("RMSClient.get (pooled)", lambda: client.get(url))
+        client.close()
+
+        print(f"speedup: {bare / pooled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
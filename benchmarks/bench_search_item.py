@@ -0,0 +1,34 @@
+"""
+Whole-catalog search_item fetch (20 pages x 100 hits) against a local stand-in server,
+walking pages one by one versus fanning out after the first page.
+
+    python -m benchmarks.bench_search_item
+"""
+import time
+
+from benchmarks.stub_server import StubRMSServer
+from handlers.item_handler import ItemHandler
+from handlers.rate_limiter import RateLimiter
+from handlers.rms_client import RMSClient
+
+
+def main():
+    with StubRMSServer(latency=0.05, total_items=2000) as server:
+        client = RMSClient("token", rate_limiter=RateLimiter(default_rate=100_000))
+        item_handler = ItemHandler("token", client=client)
+        item_handler.base_url = f"{server.url}/es/2.0/items"
+
+        timings = {}
+        for max_workers in (1, 4, 8):
+            start = time.perf_counter()
+            items = item_handler.search_item({}, page_size=100, max_page=20, max_workers=max_workers)
+            timings[max_workers] = time.perf_counter() - start
+            assert [i["item"]["manageNumber"] for i in items] == [f"item-{n}" for n in range(2000)]
+            print(f"max_workers={max_workers:<2} {len(items)} items in {timings[max_workers]:.2f}s")
+
+        print(f"speedup (8 workers): {timings[1] / timings[8]:.1f}x")
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
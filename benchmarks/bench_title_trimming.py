@@ -0,0 +1,90 @@
+"""
+Trimming long titles to the campaign frame: popping one word at a time and re-measuring the
+whole title (previous implementation) versus per-word widths with a running total.
+
+    python -m benchmarks.bench_title_trimming
+"""
+import random
+import re
+import time
+
+from handlers.payload_generator import TitleGenerator, get_display_width
+
+TITLE_COUNT = 2_000
+TITLE_FORMAT = "【SALE】{original_title} ポイント{point_rate}倍"
+
+
+def legacy_generate_and_trim_title(title_format, max_width, original_content, **kwargs):
+    bracketed_texts_map = {}
+    placeholder_counter = 0
+
+    def replace_bracketed(match):
+        nonlocal placeholder_counter
+        placeholder = f"__BRACKET_{placeholder_counter}__"
+        bracketed_texts_map[placeholder] = match.group(0)
+        placeholder_counter += 1
+        return placeholder
+
+    content_with_space_before_bracket = re.sub(r'([^\s])(【)', r'\1 \2', original_content)
+    content_with_placeholders = re.sub(r'【.*?】', replace_bracketed, content_with_space_before_bracket)
+
+    temp_title_for_frame = title_format.replace("{original_title}", "")
+    frame_width = get_display_width(temp_title_for_frame.format(original_title="", **kwargs))
+    allowed_title_width = max_width - frame_width
+
+    words = [w for w in content_with_placeholders.split(' ') if w]
+    current_width = get_display_width(' '.join(words))
+
+    while current_width > allowed_title_width:
+        if not words:
+            break
+        last_trimmable_word_index = -1
+        for i in range(len(words) - 1, -1, -1):
+            if not words[i].startswith('__BRACKET_'):
+                last_trimmable_word_index = i
+                break
+        if last_trimmable_word_index != -1:
+            words.pop(last_trimmable_word_index)
+        else:
+            words.pop()
+        temp_content_for_width_calc = ' '.join(words)
+        for placeholder, original_text in bracketed_texts_map.items():
+            temp_content_for_width_calc = temp_content_for_width_calc.replace(placeholder, original_text)
+        current_width = get_display_width(temp_content_for_width_calc)
+
+    trimmed_original_title = ' '.join(words)
+    for placeholder, original_text in bracketed_texts_map.items():
+        trimmed_original_title = trimmed_original_title.replace(placeholder, original_text)
+    return trimmed_original_title
+
+
+def make_titles(count):
+    rng = random.Random(0)
+    vocabulary = ["送料無料", "ポイント", "Tシャツ", "メンズ", "レディース", "cotton", "100%", "XL",
+                  "【公式】", "【期間限定】", "ギフト", "プレゼント", "おしゃれ", "人気", "ランキング", "【2点以上で10%OFF】"]
+    return [
+        "".join(rng.choice(vocabulary) + rng.choice((" ", " ", "", "　")) for _ in range(rng.randint(20, 120)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    titles = make_titles(TITLE_COUNT)
+    generator = TitleGenerator(TITLE_FORMAT)
+
+    start = time.perf_counter()
+    expected = [legacy_generate_and_trim_title(TITLE_FORMAT, 255, title, point_rate=10) for title in titles]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [generator._generate_and_trim_title(title, point_rate=10) for title in titles]
+    incremental_time = time.perf_counter() - start
+
+    assert actual == expected
+    print(f"legacy      {TITLE_COUNT} titles in {legacy_time:.3f}s")
+    print(f"incremental {TITLE_COUNT} titles in {incremental_time:.3f}s")
+    print(f"speedup: {legacy_time / incremental_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
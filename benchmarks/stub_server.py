@@ -0,0 +1,88 @@
+"""
+Local stand-in for the RMS API, used by the benchmarks in this package.
+Only the endpoints the handlers call are implemented, with a fixed artificial latency.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def _fake_item(manage_number: str) -> dict:
+    return {
+        "manageNumber": manage_number,
+        "title": f"{manage_number} title",
+        "hideItem": False,
+        "variants": {"v1": {"standardPrice": "1000"}},
+    }
+
+
+class StubRMSServer:
+    def __init__(self, latency: float = 0.02, total_items: int = 2000):
+        self.latency = latency
+        self.total_items = total_items
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, body: dict, status: int = 200):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _handle(self):
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                body = self._read_body() if self.command in ("POST", "PUT", "PATCH") else {}
+
+                if parsed.path.endswith("/items/search"):
+                    query = parse_qs(parsed.query)
+                    hits = int(query.get("hits", ["100"])[0])
+                    offset = int(query.get("offset", ["0"])[0])
+                    end = min(offset + hits, stub.total_items)
+                    results = [{"item": _fake_item(f"item-{i}")} for i in range(offset, end)]
+                    return self._send_json({"numFound": stub.total_items, "offset": offset, "results": results})
+                if parsed.path.endswith("/items/bulk-get"):
+                    return self._send_json({"results": [_fake_item(m) for m in body.get("manageNumbers", [])]})
+                if "/items/manage-numbers/" in parsed.path and self.command == "GET":
+                    return self._send_json(_fake_item(parsed.path.rsplit("/", 1)[-1]))
+                return self._send_json({})
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        return Handler
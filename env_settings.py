@@ -1,5 +1,6 @@
 import base64
 from pathlib import Path
+from typing import Dict
 
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,6 +20,16 @@ class EnvSettings(BaseSettings):
     LICENSE_KEY: str = "your_license_key"
     TENPO_NAME: str = "giftoftw"
 
+    # RMS transport
+    RMS_TIMEOUT: float = 30.0  # 單次請求逾時秒數
+    RMS_POOL_MAXSIZE: int = 16  # 每個 host 保留的 keep-alive 連線數
+    RMS_MAX_IN_FLIGHT: int = 8  # 非同步 handler 同時發出的請求上限（不應大於 RMS_POOL_MAXSIZE）
+    RMS_RATE_LIMIT: float = 5.0  # 每個 endpoint 每秒請求數
+    RMS_ENDPOINT_RATE_LIMITS: Dict[str, float] = {}  # 個別 endpoint 的每秒請求數，e.g. {"items/search": 1}
+    RMS_MAX_RETRIES: int = 4  # 429 / 5xx 的重試次數
+    RMS_BACKOFF_BASE: float = 1.0  # 指數退避的起始秒數
+    RMS_BACKOFF_MAX: float = 30.0  # 指數退避的最大秒數
+
     @computed_field
     @property
     def auth_token(self) -> str:
@@ -1,9 +1,11 @@
-from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
 from handlers.payload_generator import CampaignPayloadGenerator
-from models.item import ProductData
+from handlers.payload_store import JsonlPayloadStore
+from models.item import ProductData, ProductDescription
 
 
 class CampaignConfig(BaseModel):
@@ -41,31 +43,70 @@ class CampaignConfig(BaseModel):
             self.no_event_html_format += "{original_html}"
 
 
+def _slim_product(product: ProductData) -> Tuple[Optional[str], bool, Optional[str], Optional[str]]:
+    """Only the fields payload generation reads: (title, has description, description sp, sales description)."""
+    description = product.product_description
+    return product.title, description is not None, description.sp if description else None, product.sales_description
+
+
+def _generate_shard(
+        generator: CampaignPayloadGenerator,
+        slim_products: List[Tuple[Optional[str], bool, Optional[str], Optional[str]]],
+        item_kwargs: List[Dict],
+) -> List[Dict]:
+    """Process pool worker: rebuilds minimal ProductData objects and generates their payloads."""
+    products = [
+        ProductData.model_construct(
+            title=title,
+            product_description=ProductDescription.model_construct(sp=sp) if has_description else None,
+            sales_description=sales_description,
+        )
+        for title, has_description, sp, sales_description in slim_products
+    ]
+    return generator.generate_batch(products, item_kwargs)
+
+
 class CampaignUpdateFlow:
     """
     A flow to process campaign data and generate the final API payloads for updates.
     It receives all necessary product data and campaign configurations upon execution.
     """
 
+    # 多行程模式下每個 worker 一次處理的商品數
+    SHARD_SIZE = 2000
+
     def __init__(self):
         """Initializes the flow."""
         self.original_items_cache: Dict[str, ProductData] = {}
+        self.unchanged_item_ids: Set[str] = set()
+        self._executor: Optional[ProcessPoolExecutor] = None
 
     def execute(
             self,
-            all_products: List[ProductData],
+            all_products: Iterable[ProductData],
             config: CampaignConfig,
             point_campaigns: List[Dict],
             feature_campaigns: List[Dict],
+            skip_unchanged: bool = False,
+            processes: Optional[int] = None,
+            sink: Optional[JsonlPayloadStore] = None,
     ) -> Dict[str, Dict]:
         """
         Executes the workflow by categorizing items and generating payloads.
 
         Args:
-            all_products: A list of all product data objects.
+            all_products: All product data objects. May be a lazy iterator
+                (e.g. ItemHandler.iter_search_products); it is consumed once.
             config: A configuration object containing all templates and times.
             point_campaigns: A list of point campaign dicts.
             feature_campaign: A single feature campaign dict.
+            skip_unchanged: If True, drops payload fields that already match the item's
+                current data and skips items with nothing left to update.
+            processes: If greater than 1 and a category is larger than SHARD_SIZE, large categories
+                are split into shards and generated on a process pool of this size. Workers only receive the title and
+                description fields they need; the result is identical to a single-process run.
+            sink: If given, payloads are appended to this JSONL store one item at a time as they are generated
+                instead of being collected in memory, and an empty dict is returned.
 
         Returns:
             A dictionary where keys are manageNumbers and values are the generated payloads.
@@ -93,30 +134,94 @@ class CampaignUpdateFlow:
         )
 
         # 3. Process each category and generate the corresponding payloads.
-        all_payloads = {}
-        all_payloads.update(
-            self._process_point_feature_items(
-                categories["point_and_feature"],
-                config,
-                item_to_point_rate,
-                item_to_campaign_code,
-            )
+        # 4. Optionally drop fields that would not change anything.
+        self.unchanged_item_ids = set()
+        payloads = self._iter_payloads(categories, config, item_to_point_rate, item_to_campaign_code)
+        # 沒有任何分類超過一個 shard 時，啟動 process pool 與 pickle 的成本比省下的時間多
+        use_processes = (
+                processes and processes > 1 and max(len(ids) for ids in categories.values()) > self.SHARD_SIZE
         )
-        all_payloads.update(
-            self._process_point_only_items(
-                categories["point_only"], config, item_to_point_rate
-            )
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                self._executor = executor
+                try:
+                    all_payloads = self._collect_payloads(payloads, skip_unchanged, sink)
+                finally:
+                    self._executor = None
+        else:
+            all_payloads = self._collect_payloads(payloads, skip_unchanged, sink)
+        print("\n".join(categories["no_event"]))
+        return all_payloads
+
+    def _iter_payloads(
+            self,
+            categories: Dict[str, Set[str]],
+            config: CampaignConfig,
+            item_to_point_rate: Dict[str, int],
+            item_to_campaign_code: Dict[str, str],
+    ) -> Iterator[Tuple[str, Dict]]:
+        """Yields (item_id, payload) for every category in turn, one item at a time."""
+        yield from self._process_point_feature_items(
+            categories["point_and_feature"],
+            config,
+            item_to_point_rate,
+            item_to_campaign_code,
         )
-        all_payloads.update(
-            self._process_feature_only_items(
-                categories["feature_only"], config, item_to_campaign_code
-            )
+        yield from self._process_point_only_items(
+            categories["point_only"], config, item_to_point_rate
         )
-        all_payloads.update(
-            self._process_no_event_items(categories["no_event"], config)
+        yield from self._process_feature_only_items(
+            categories["feature_only"], config, item_to_campaign_code
         )
-        print("\n".join(categories["no_event"]))
-        return all_payloads
+        yield from self._process_no_event_items(categories["no_event"], config)
+
+    def _collect_payloads(
+            self,
+            payloads: Iterable[Tuple[str, Dict]],
+            skip_unchanged: bool,
+            sink: Optional[JsonlPayloadStore],
+    ) -> Dict[str, Dict]:
+        """Merges the payloads into a dict, or writes them to the sink one item at a time."""
+        if skip_unchanged:
+            payloads = self._drop_unchanged(payloads)
+        if sink is not None:
+            sink.write_all(payloads)
+            return {}
+        return dict(payloads)
+
+    def _drop_unchanged(self, payloads: Iterable[Tuple[str, Dict]]) -> Iterator[Tuple[str, Dict]]:
+        """Keeps only the fields that differ from the cached original item."""
+        for item_id, payload in payloads:
+            original_data = self.original_items_cache.get(item_id)
+            diff = self._diff_payload(payload, original_data) if original_data else payload
+            if diff:
+                yield item_id, diff
+            else:
+                self.unchanged_item_ids.add(item_id)
+
+    @staticmethod
+    def _diff_payload(payload: Dict, original_data: ProductData) -> Dict:
+        """Compares title, productDescription.sp, salesDescription and pointCampaign field by field."""
+        # from_api 建立的商品以 RMS 上實際的 salesDescription 比較，而不是補上 PC 說明文後的 sales_description
+        if "api_sales_description" in original_data.model_fields_set:
+            current_sales_description = original_data.api_sales_description
+        else:
+            current_sales_description = original_data.sales_description
+        current_values = {
+            "title": original_data.title or "",
+            "productDescription": {
+                "sp": original_data.product_description.sp or "" if original_data.product_description else ""
+            },
+            "salesDescription": current_sales_description or "",
+            "pointCampaign": (
+                original_data.point_campaign.model_dump(by_alias=True) if original_data.point_campaign else None
+            ),
+        }
+        return {
+            key: value
+            for key, value in payload.items()
+            if key not in current_values or value != current_values[key]
+        }
 
     def _build_lookup_maps(
             self, point_campaigns: List[Dict], feature_campaigns: List[Dict]
@@ -154,16 +259,48 @@ class CampaignUpdateFlow:
             "no_event": no_event_ids,
         }
 
+    def _generate_batch(
+            self,
+            generator: CampaignPayloadGenerator,
+            item_ids: Set[str],
+            kwargs_for: Optional[Callable[[str], Dict]] = None,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yields (item_id, payload) for all cached items in item_ids.
+        In multi-process mode the batch is split into shards of SHARD_SIZE items, and only one
+        shard's results are held at a time.
+        """
+        batch_ids = [item_id for item_id in item_ids if item_id in self.original_items_cache]
+        products = [self.original_items_cache[item_id] for item_id in batch_ids]
+        item_kwargs = [kwargs_for(item_id) for item_id in batch_ids] if kwargs_for else [{}] * len(batch_ids)
+
+        if self._executor is None or len(batch_ids) <= self.SHARD_SIZE:
+            for item_id, product, kwargs in zip(batch_ids, products, item_kwargs):
+                yield item_id, generator.generate(product, **kwargs)
+            return
+
+        futures = [
+            self._executor.submit(
+                _generate_shard,
+                generator,
+                [_slim_product(product) for product in products[i:i + self.SHARD_SIZE]],
+                item_kwargs[i:i + self.SHARD_SIZE],
+            )
+            for i in range(0, len(batch_ids), self.SHARD_SIZE)
+        ]
+        for i, future in enumerate(futures):
+            yield from zip(batch_ids[i * self.SHARD_SIZE:(i + 1) * self.SHARD_SIZE], future.result())
+
     def _process_point_feature_items(
             self,
             item_ids: Set[str],
             config: CampaignConfig,
             item_to_point_rate: Dict[str, int],
             item_to_campaign_code: Dict[str, str],
-    ) -> Dict[str, Dict]:
+    ) -> Iterator[Tuple[str, Dict]]:
         """Processes items that are in both a point and a feature campaign."""
         if not item_ids:
-            return {}
+            return iter(())
 
         point_title_prefix = config.point_title_format.split("{original_title}")[0]
         feature_title_suffix = config.feature_title_format.split("{original_title}")[1]
@@ -177,27 +314,20 @@ class CampaignUpdateFlow:
             start_time=config.start_time,
             end_time=config.end_time,
         )
-        payloads = {}
-        for item_id in item_ids:
-            original_data = self.original_items_cache.get(item_id)
-            if original_data:
-                payload = generator.generate(
-                    original_data,
-                    point_rate=item_to_point_rate[item_id],
-                    campaign_code=item_to_campaign_code[item_id],
-                )
-                payloads[item_id] = payload
-        return payloads
+        return self._generate_batch(generator, item_ids, lambda item_id: {
+            "point_rate": item_to_point_rate[item_id],
+            "campaign_code": item_to_campaign_code[item_id],
+        })
 
     def _process_point_only_items(
             self,
             item_ids: Set[str],
             config: CampaignConfig,
             item_to_point_rate: Dict[str, int],
-    ) -> Dict[str, Dict]:
+    ) -> Iterator[Tuple[str, Dict]]:
         """Processes items that are only in a point campaign."""
         if not item_ids:
-            return {}
+            return iter(())
 
         generator = CampaignPayloadGenerator(
             title_format=config.point_title_format,
@@ -205,55 +335,37 @@ class CampaignUpdateFlow:
             start_time=config.start_time,
             end_time=config.end_time,
         )
-        payloads = {}
-        for item_id in item_ids:
-            original_data = self.original_items_cache.get(item_id)
-            if original_data:
-                payload = generator.generate(
-                    original_data, point_rate=item_to_point_rate[item_id]
-                )
-                payloads[item_id] = payload
-        return payloads
+        return self._generate_batch(generator, item_ids, lambda item_id: {
+            "point_rate": item_to_point_rate[item_id],
+        })
 
     def _process_feature_only_items(
             self,
             item_ids: Set[str],
             config: CampaignConfig,
             item_to_campaign_code: Dict[str, str],
-    ) -> Dict[str, Dict]:
+    ) -> Iterator[Tuple[str, Dict]]:
         """Processes items that are only in a feature campaign."""
         if not item_ids:
-            return {}
+            return iter(())
 
         generator = CampaignPayloadGenerator(
             title_format=config.feature_title_format,
             html_format=config.feature_html_format,
         )
-        payloads = {}
-        for item_id in item_ids:
-            original_data = self.original_items_cache.get(item_id)
-            if original_data:
-                payload = generator.generate(
-                    original_data, campaign_code=item_to_campaign_code[item_id]
-                )
-                payloads[item_id] = payload
-        return payloads
+        return self._generate_batch(generator, item_ids, lambda item_id: {
+            "campaign_code": item_to_campaign_code[item_id],
+        })
 
     def _process_no_event_items(
             self, item_ids: Set[str], config: CampaignConfig
-    ) -> Dict[str, Dict]:
+    ) -> Iterator[Tuple[str, Dict]]:
         """Processes items that are not in any campaign."""
         if not item_ids or not config.no_event_html_format:
-            return {}
+            return iter(())
 
         generator = CampaignPayloadGenerator(html_format=config.no_event_html_format)
-        payloads = {}
-        for item_id in item_ids:
-            original_data = self.original_items_cache.get(item_id)
-            if original_data:
-                payload = generator.generate(original_data)
-                payloads[item_id] = payload
-        return payloads
+        return self._generate_batch(generator, item_ids)
 
     def _process_point_events(self, data: Dict) -> Dict[str, Dict]:
         if not data.get("campaigns"):
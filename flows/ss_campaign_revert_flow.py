@@ -1,6 +1,12 @@
 import traceback
+from typing import Dict, List, Tuple
+
 import requests
 from handlers.item_handler import ItemHandler
+from env_settings import EnvSettings
+from utils.task_graph import TaskGraphRunner
+
+env_settings = EnvSettings()
 
 
 class SSCampaignRevertFlow:
@@ -8,70 +14,139 @@ class SSCampaignRevertFlow:
     處理超級特賣 (Super Sale) 活動商品還原的流程。
     """
 
-    def __init__(self, auth_token: str, logger=print):
+    STEP_LABELS = {
+        "delete_campaign_item": "Delete campaign item (_sscp)",
+        "revert_original": "Unhide original item",
+    }
+
+    def __init__(self, auth_token: str, logger=print, max_workers: int = env_settings.RMS_MAX_IN_FLIGHT):
         self.item_handler = ItemHandler(auth_token)
         self.logger = logger
+        self.max_workers = max_workers
 
-    def run(self, manage_numbers: list[str]):
+    def run(self, manage_numbers: list[str], dry_run: bool = False):
         """
         執行整個活動商品還原流程。
+        1. 以 bulk-get 一次讀出原始商品與 _sscp 商品，決定每個商品還需要哪些步驟
+        2. 各商品同時進行：刪除 _sscp 商品後再重新顯示原始商品
+        已不存在的 _sscp 商品、已是顯示狀態的原始商品都會直接略過，重複執行不會有副作用，
+        中斷後直接重新執行即可，不需要步驟紀錄。
+        dry_run 為 True 時只列出會變更的內容，不送出任何寫入請求。
         """
-        self.logger("--- SS Campaign Revert Flow Start ---")
+        self.logger("--- SS Campaign Revert Flow Start ---" + (" (dry run)" if dry_run else ""))
         if not manage_numbers:
             self.logger("No items to process.")
             return
 
+        plan = self.plan_revert(manage_numbers)
+        if dry_run:
+            self._log_plan(plan)
+            self.logger("--- Flow End ---")
+            return
+
+        tasks = {}
+        for manage_number, steps in plan.items():
+            if "delete_campaign_item" in steps:
+                tasks[(manage_number, "delete_campaign_item")] = (
+                    lambda number=manage_number: self._delete_sscp_item(f"{number}_sscp"), []
+                )
+            if "revert_original" in steps:
+                deps = [(manage_number, "delete_campaign_item")] if "delete_campaign_item" in steps else []
+                tasks[(manage_number, "revert_original")] = (
+                    lambda *_, number=manage_number: self._revert_original_item(number), deps
+                )
+
+        # {manage_number: (step, error)}，只記錄每個商品第一個失敗的步驟
+        item_errors: Dict[str, Tuple[str, Exception]] = {}
+
+        def log_step(key, result, error):
+            manage_number, step = key
+            if error is None:
+                if result is False:
+                    self.logger(f"  - {manage_number}: Campaign item not found, skipping deletion.")
+                else:
+                    self.logger(f"  - {manage_number}: {self.STEP_LABELS[step]} done.")
+            else:
+                self.logger(f"  - {manage_number}: {self.STEP_LABELS[step]} failed. "
+                            f"Reason: {self._describe_error(error)}")
+                item_errors.setdefault(manage_number, (step, error))
+
+        TaskGraphRunner(self.max_workers).run(tasks, on_done=log_step)
+
         successful_items = []
         failed_items = {}
-
         for manage_number in manage_numbers:
-            self.logger(f"\nProcessing item for revert: {manage_number}")
-            try:
-                self._process_revert(manage_number)
+            if manage_number in item_errors:
+                step, error = item_errors[manage_number]
+                if isinstance(error, requests.exceptions.HTTPError):
+                    failed_items[manage_number] = (f"Failed to revert {manage_number}. "
+                                                   f"Reason: {self._describe_error(error)}")
+                else:
+                    failed_items[manage_number] = (f"An unexpected error occurred while reverting "
+                                                   f"{manage_number}. Reason: {error}")
+                    traceback.print_exception(error)
+            else:
                 successful_items.append(manage_number)
-                self.logger(f"  - Successfully reverted {manage_number}.")
-            except requests.exceptions.HTTPError as e:
-                error_message = f"Failed to revert {manage_number}. Reason: {e.response.status_code} {e.response.text}"
-                self.logger(f"  - Error: {error_message}")
-                failed_items[manage_number] = error_message
-            except Exception as e:
-                error_message = f"An unexpected error occurred while reverting {manage_number}. Reason: {e}"
-                self.logger(f"  - Error: {error_message}")
-                failed_items[manage_number] = error_message
-                traceback.print_exc()
 
         self._log_summary(len(manage_numbers), successful_items, failed_items)
 
-    def _process_revert(self, manage_number: str):
+    def plan_revert(self, manage_numbers: List[str]) -> Dict[str, List[str]]:
         """
-        處理單一商品的還原流程。
+        以 bulk-get 讀出原始商品與 _sscp 商品的目前狀態，回傳每個商品還需要執行的步驟。
+        讀取失敗的商品無法判斷狀態，兩個步驟都會保留（步驟本身可重複執行）。
+
+        Returns:
+            {manage_number: [step, ...]}，已還原完成的商品為空列表。
         """
-        # 1. 刪除 sscp 商品
-        sscp_manage_number = f"{manage_number}_sscp"
-        self._delete_sscp_item(sscp_manage_number)
+        sscp_numbers = [f"{manage_number}_sscp" for manage_number in manage_numbers]
+        self.logger(f"Reading current state of {len(manage_numbers)} items and their campaign items...")
+        items, fetch_failures = self.item_handler.bulk_get_item_with_failures(manage_numbers + sscp_numbers)
+        items_by_number = {item.get("manageNumber"): item for item in items}
 
-        # 2. 還原原始商品狀態
-        self._revert_original_item(manage_number)
+        plan = {}
+        for manage_number in manage_numbers:
+            steps = []
+            sscp_manage_number = f"{manage_number}_sscp"
+            if sscp_manage_number in items_by_number or sscp_manage_number in fetch_failures:
+                steps.append("delete_campaign_item")
+            original = items_by_number.get(manage_number)
+            if original is None or original.get("hideItem") or original.get("purchasablePeriod"):
+                steps.append("revert_original")
+            plan[manage_number] = steps
+        return plan
 
-    def _delete_sscp_item(self, manage_number: str):
-        self.logger(f"  - Deleting campaign item: {manage_number}...")
+    def _log_plan(self, plan: Dict[str, List[str]]):
+        for manage_number, steps in plan.items():
+            if steps:
+                labels = ", ".join(self.STEP_LABELS[step] for step in steps)
+                self.logger(f"  - {manage_number}: would {labels}.")
+            else:
+                self.logger(f"  - {manage_number}: already reverted, nothing to do.")
+        changed = sum(1 for steps in plan.values() if steps)
+        self.logger(f"\n{changed} of {len(plan)} items would be changed.")
+
+    @staticmethod
+    def _describe_error(error: Exception) -> str:
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            return f"{error.response.status_code} {error.response.text}"
+        return str(error)
+
+    def _delete_sscp_item(self, manage_number: str) -> bool:
+        """刪除 _sscp 商品；商品已不存在 (404) 時回傳 False。"""
         try:
             self.item_handler.delete_item(manage_number)
-            self.logger(f"  - Successfully deleted {manage_number}.")
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
-                self.logger(f"  - Campaign item {manage_number} not found, skipping deletion.")
-            else:
-                raise
+                return False
+            raise
+        return True
 
     def _revert_original_item(self, manage_number: str):
-        self.logger(f"  - Reverting original item: {manage_number}...")
         payload = {
             "hideItem": False,
             "purchasablePeriod": None
         }
         self.item_handler.patch_item(manage_number, payload)
-        self.logger(f"  - Unhidden and cleared purchasable period for {manage_number}.")
 
     def _log_summary(self, total: int, successful: list, failed: dict):
         self.logger("\n--- SS Campaign Revert Flow Summary ---")
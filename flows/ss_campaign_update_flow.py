@@ -1,5 +1,6 @@
+import math
 import traceback
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 
 import requests
@@ -7,6 +8,11 @@ import requests
 from handlers.inventory_handler import InventoryHandler
 from handlers.item_handler import ItemHandler
 from handlers.category_handler import CategoryHandler
+from env_settings import EnvSettings
+from utils.step_journal import StepJournal
+from utils.task_graph import TaskGraphRunner, TaskGraphResult
+
+env_settings = EnvSettings()
 
 
 class SSCampaignUpdateFlow:
@@ -14,11 +20,30 @@ class SSCampaignUpdateFlow:
     處理超級特賣 (Super Sale) 活動商品更新的流程。
     """
 
-    def __init__(self, auth_token: str, campaign_start: str, campaign_end: str, logger = print):
+    STEP_LABELS = {
+        "get_item": "Fetch item data",
+        "get_category": "Fetch category mapping",
+        "get_variants": "Fetch variant list",
+        "create_item": "Create campaign item (_sscp)",
+        "inventory": "Copy inventory to campaign item",
+        "category": "Set campaign item category",
+        "update_original": "Hide original item",
+    }
+
+    # 只有會修改 RMS 資料的步驟寫入 journal。讀取步驟續跑時重新執行，
+    # 使用者在中斷後於 RMS 修正的商品資料才會被用上
+    JOURNALED_STEPS = ("create_item", "inventory", "category", "update_original")
+    # 讀取步驟 -> 使用其結果的步驟；使用的步驟已完成時不需要再讀取
+    READ_STEP_CONSUMERS = {"get_item": "create_item", "get_category": "category", "get_variants": "inventory"}
+
+    def __init__(self, auth_token: str, campaign_start: str, campaign_end: str, logger=print,
+                 max_workers: int = env_settings.RMS_MAX_IN_FLIGHT, journal: Optional[StepJournal] = None):
         self.item_handler = ItemHandler(auth_token)
         self.category_handler = CategoryHandler(auth_token)
         self.inventory_handler = InventoryHandler(auth_token)
         self.logger = logger
+        self.max_workers = max_workers
+        self.journal = journal
         self.jst = timezone(timedelta(hours=9))
         self.campaign_start = datetime.fromisoformat(campaign_start).astimezone(self.jst)
         self.campaign_end = datetime.fromisoformat(campaign_end).astimezone(self.jst)
@@ -26,64 +51,145 @@ class SSCampaignUpdateFlow:
     def run(self, manage_numbers: list[str]):
         """
         執行整個活動商品更新流程。
+        1. 各商品依相依關係同時進行：取得資料、建立活動商品、設定類別、取得 SKU 清單
+        2. 所有商品的庫存合併成少數幾次 bulk 請求複製到活動商品
+        3. 活動商品都準備好的原始商品才隱藏
+        有 journal 時，已完成的步驟會被略過，每個商品從第一個未完成的步驟繼續。
         """
         self.logger("--- SS Campaign Update Flow Start ---")
         if not manage_numbers:
             self.logger("No items to process.")
             return
 
+        completed_steps = self._completed_steps()
+        if completed_steps:
+            self.logger(f"Resuming from journal {self.journal.path.name}: "
+                        f"{len(completed_steps)} completed steps will be skipped.")
+
+        # {manage_number: (step, error)}，只記錄每個商品第一個失敗的步驟
+        item_errors: Dict[str, Tuple[str, Exception]] = {}
+
+        # 1. 各商品的準備步驟
+        prepare_tasks = {}
+        for manage_number in manage_numbers:
+            prepare_tasks.update(self._build_item_tasks(manage_number))
+        prepare_result = self._run_tasks(prepare_tasks, item_errors)
+
+        # 2. 跨商品批次複製庫存
+        variants_by_item = {
+            manage_number: prepare_result.results[(manage_number, "get_variants")]
+            for manage_number in manage_numbers
+            if manage_number not in item_errors and not self._is_done(manage_number, "inventory")
+        }
+        self._copy_inventories(variants_by_item, item_errors)
+        if self.journal:
+            for manage_number in variants_by_item:
+                if manage_number not in item_errors:
+                    self.journal.record(manage_number, "inventory")
+
+        # 3. 更新原始商品狀態
+        update_tasks = {
+            (manage_number, "update_original"): (
+                lambda number=manage_number: self._update_original_item_status(number), []
+            )
+            for manage_number in manage_numbers if manage_number not in item_errors
+        }
+        self._run_tasks(update_tasks, item_errors)
+
         successful_items = []
         failed_items = {}
-
         for manage_number in manage_numbers:
-            self.logger(f"\nProcessing item: {manage_number}")
-            try:
-                self._process_item(manage_number)
+            if manage_number in item_errors:
+                step, error = item_errors[manage_number]
+                failed_items[manage_number] = (f"Failed to process {manage_number} at step '{step}'. "
+                                               f"Reason: {self._describe_error(error)}")
+                if not isinstance(error, requests.exceptions.HTTPError):
+                    traceback.print_exception(error)
+            else:
                 successful_items.append(manage_number)
-                self.logger(f"  - Successfully processed {manage_number}.")
-            except requests.exceptions.HTTPError as e:
-                error_message = f"Failed to process {manage_number}. Reason: {e.response.status_code} {e.response.text}"
-                self.logger(f"  - Error: {error_message}")
-                failed_items[manage_number] = error_message
-            except Exception as e:
-                error_message = f"An unexpected error occurred while processing {manage_number}. Reason: {e}"
-                self.logger(f"  - Error: {error_message}")
-                failed_items[manage_number] = error_message
-                traceback.print_exc()
 
         self._log_summary(len(manage_numbers), successful_items, failed_items)
 
-    def _process_item(self, manage_number: str):
-        """
-        處理單一商品的更新流程。
-        """
-        # 1. 取得商品和類別資訊
-        item = self._get_item_data(manage_number)
-        category_data = self._get_category_data(manage_number)
+        # 全部完成後紀錄就不再需要；有失敗時保留，下次可從中斷處繼續
+        if self.journal and not failed_items:
+            self.journal.reset()
 
-        # 2. 建立新的活動商品
-        new_manage_number = f"{manage_number}_sscp"
-        self._create_campaign_item(new_manage_number, item)
+    def _is_done(self, manage_number: str, step: str) -> bool:
+        return step in self.JOURNALED_STEPS and bool(self.journal) and self.journal.is_done(manage_number, step)
 
-        # 3. 處理庫存
-        self._handle_inventory(manage_number, new_manage_number)
+    def _completed_steps(self) -> Dict:
+        if not self.journal:
+            return {}
+        # 舊版 journal 可能含有讀取步驟的結果，不再重複使用
+        return {key: result for key, result in self.journal.completed_steps().items()
+                if key[1] in self.JOURNALED_STEPS}
 
-        # 4. 設定新商品的類別
-        self._update_category_mapping(new_manage_number, category_data)
+    def _run_tasks(self, tasks: Dict, item_errors: Dict[str, Tuple[str, Exception]]) -> TaskGraphResult:
+        def log_step(key, result, error):
+            manage_number, step = key
+            if error is None:
+                if self.journal and step in self.JOURNALED_STEPS:
+                    self.journal.record(manage_number, step, result)
+                self.logger(f"  - {manage_number}: {self.STEP_LABELS[step]} done.")
+            else:
+                self.logger(f"  - {manage_number}: {self.STEP_LABELS[step]} failed. "
+                            f"Reason: {self._describe_error(error)}")
+                item_errors.setdefault(manage_number, (step, error))
 
-        # 5. 更新原始商品狀態
-        self._update_original_item_status(manage_number)
+        return TaskGraphRunner(self.max_workers).run(tasks, on_done=log_step, completed=self._completed_steps())
+
+    def _build_item_tasks(self, manage_number: str) -> Dict:
+        """
+        單一商品的準備步驟與相依關係：
+        get_item ──> create_item ──┬─> category
+        get_category ──────────────┘
+        get_variants（結果留給跨商品的庫存批次複製）
+        journal 中已完成的步驟不會再執行，只有結果還會被用到的讀取步驟才保留。
+        """
+        new_manage_number = f"{manage_number}_sscp"
+        tasks = {
+            # 1. 取得商品、類別與 SKU 資訊
+            (manage_number, "get_item"): (
+                lambda: self._get_item_data(manage_number), []
+            ),
+            (manage_number, "get_category"): (
+                lambda: self._get_category_data(manage_number), []
+            ),
+            (manage_number, "get_variants"): (
+                lambda: self._get_variants(manage_number), []
+            ),
+            # 2. 建立新的活動商品
+            (manage_number, "create_item"): (
+                lambda item: self._create_campaign_item(new_manage_number, item),
+                [(manage_number, "get_item")]
+            ),
+            # 3. 設定新商品的類別
+            (manage_number, "category"): (
+                lambda _, category_data: self._update_category_mapping(new_manage_number, category_data),
+                [(manage_number, "create_item"), (manage_number, "get_category")]
+            ),
+        }
+        for read_step, consumer in self.READ_STEP_CONSUMERS.items():
+            if self._is_done(manage_number, consumer):
+                del tasks[(manage_number, read_step)]
+        for key, (func, deps) in tasks.items():
+            if self._is_done(*key):
+                tasks[key] = (func, [])  # 已完成，不等待已被移除的讀取步驟
+        return tasks
+
+    @staticmethod
+    def _describe_error(error: Exception) -> str:
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            return f"{error.response.status_code} {error.response.text}"
+        return str(error)
 
     def _get_item_data(self, manage_number: str) -> Dict[str, Any]:
-        self.logger(f"  - Fetching detailed item data for {manage_number}...")
         return self.item_handler.get_item(manage_number)
 
     def _get_category_data(self, manage_number: str) -> Dict[str, Any]:
-        self.logger(f"  - Getting category mapping for {manage_number}...")
         return self.category_handler.get_category_mapping(manage_number)
 
     def _create_campaign_item(self, new_manage_number: str, item_data: Dict[str, Any]):
-        self.logger(f"  - Creating new campaign item: {new_manage_number}...")
         new_item = item_data.copy()
         new_item["hideItem"] = False
         
@@ -101,35 +207,69 @@ class SSCampaignUpdateFlow:
         new_item.pop('updated', None)
         self.item_handler.upsert_item(new_manage_number, new_item)
 
-    def _handle_inventory(self, original_manage_number: str, new_manage_number: str):
-        self.logger(f"  - Fetching and setting inventory for variants...")
-        variants_response = self.inventory_handler.get_variant_list(original_manage_number)
-        variants = variants_response.get("variantList", [])
+    def _get_variants(self, manage_number: str) -> List[str]:
+        variants_response = self.inventory_handler.get_variant_list(manage_number)
+        return variants_response.get("variantList", [])
 
-        if not variants:
-            self.logger(f"    - No variants found for {original_manage_number}.")
+    def _copy_inventories(self, variants_by_item: Dict[str, List[str]],
+                          item_errors: Dict[str, Tuple[str, Exception]]):
+        """
+        將所有商品的庫存一次讀出（每次最多 BULK_GET_LIMIT 筆），
+        再以 BULK_UPSERT_LIMIT 筆為一批寫入對應的活動商品。
+        某一批失敗時，只有該批內的商品會被標記為失敗。
+        """
+        inventory_query = [
+            {"manageNumber": manage_number, "variantId": variant_id}
+            for manage_number, variants in variants_by_item.items()
+            for variant_id in variants
+        ]
+        if not inventory_query:
             return
+        self.logger(f"\nCopying inventory for {len(inventory_query)} variants of {len(variants_by_item)} items...")
 
-        self.logger(f"    - Found {len(variants)} variants.")
-        inventory_query = [{"manageNumber": original_manage_number, "variantId": v} for v in variants]
-        inventory_data = self.inventory_handler.bulk_get_inventory(inventory_query)
-        inventories = inventory_data.get("inventories", [])
-
-        if inventories:
-            new_inventories = [
-                {
-                    "manageNumber": new_manage_number,
-                    "variantId": inv["variantId"],
-                    "mode": "ABSOLUTE",
-                    "quantity": inv.get("quantity", 0)
-                }
-                for inv in inventories
-            ]
-            self.inventory_handler.bulk_upsert(new_inventories)
-            self.logger(f"    - Successfully set inventory for {len(new_inventories)} variants of {new_manage_number}.")
+        inventories = []
+        read_limit = InventoryHandler.BULK_GET_LIMIT
+        for i in range(0, len(inventory_query), read_limit):
+            chunk = inventory_query[i:i + read_limit]
+            try:
+                inventory_data = self.inventory_handler.bulk_get_inventory(chunk)
+                inventories.extend(inventory_data.get("inventories", []))
+            except Exception as e:
+                self._fail_inventory_chunk(chunk, e, item_errors)
+
+        new_inventories = [
+            {
+                "manageNumber": f"{inv['manageNumber']}_sscp",
+                "variantId": inv["variantId"],
+                "mode": "ABSOLUTE",
+                "quantity": inv.get("quantity", 0)
+            }
+            for inv in inventories if inv.get("manageNumber") not in item_errors
+        ]
+
+        write_limit = InventoryHandler.BULK_UPSERT_LIMIT
+        for i in range(0, len(new_inventories), write_limit):
+            chunk = new_inventories[i:i + write_limit]
+            try:
+                self.inventory_handler.bulk_upsert(chunk)
+            except Exception as e:
+                self._fail_inventory_chunk(
+                    [dict(inv, manageNumber=inv["manageNumber"].removesuffix("_sscp")) for inv in chunk],
+                    e, item_errors
+                )
+
+        self.logger(f"  - Inventory copied with {math.ceil(len(inventory_query) / read_limit)} read "
+                    f"and {math.ceil(len(new_inventories) / write_limit)} write requests.")
+
+    def _fail_inventory_chunk(self, chunk: List[Dict], error: Exception,
+                              item_errors: Dict[str, Tuple[str, Exception]]):
+        manage_numbers = list(dict.fromkeys(inv["manageNumber"] for inv in chunk))
+        self.logger(f"  - {self.STEP_LABELS['inventory']} failed for {len(manage_numbers)} items. "
+                    f"Reason: {self._describe_error(error)}")
+        for manage_number in manage_numbers:
+            item_errors.setdefault(manage_number, ("inventory", error))
 
     def _update_category_mapping(self, new_manage_number: str, category_data: Dict[str, Any]):
-        self.logger(f"  - Setting category for {new_manage_number}...")
         self.category_handler.update_category_mapping(
             new_manage_number,
             category_data["categoryIds"],
@@ -137,7 +277,6 @@ class SSCampaignUpdateFlow:
         )
 
     def _update_original_item_status(self, manage_number: str):
-        self.logger(f"  - Updating original item: {manage_number}...")
         payload = {
             "hideItem": True,
             "purchasablePeriod": {
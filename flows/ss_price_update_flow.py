@@ -1,6 +1,14 @@
-from typing import List, Dict, Any
-import math
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from env_settings import EnvSettings
+from handlers.batch_executor import BatchWriteExecutor, ItemWriteResult
 from handlers.item_handler import ItemHandler
+from handlers.price_rules import PriceRuleEngine, PriceRuleSet, build_patch_payloads, variants_to_frame
+from handlers.price_snapshot_store import PriceSnapshotStore
+
+env_settings = EnvSettings()
 
 
 class BasePriceFlow:
@@ -9,47 +17,82 @@ class BasePriceFlow:
     Handles fetching, processing, and updating items.
     """
 
-    def __init__(self, auth_token: str, logger=print):
+    def __init__(self, auth_token: str, logger=print, chunk_size: int = 50,
+                 max_workers: int = env_settings.RMS_MAX_IN_FLIGHT):
         self.item_handler = ItemHandler(auth_token=auth_token)
         self.logger = logger
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
 
     def run(self, item_ids: List[str]):
-        self.logger(f"Fetching {len(item_ids)} items...")
-        items = self.item_handler.bulk_get_item(manage_numbers=item_ids)
-        self.logger(f"Found {len(items)} items.")
-
+        """
+        讀取、計算、寫入三個階段以串流方式重疊進行：
+        - bulk-get 以 chunk_size 筆為一組在背景下載，最多預先抓取 2 組
+        - 每組下載完成後立即計算 payload 並交給寫入執行緒池（同時送出的請求有上限）
+        第一筆 patch 在第一組下載完成後就會送出，不必等全部商品下載完。
+        所有 logger 呼叫都在呼叫端執行緒上，可安全寫入 Streamlit。
+        """
         successful_items = []
         failed_items = {}
 
-        for item in items:
-            manage_number = item.get("manageNumber")
-            if not manage_number:
-                continue
+        def log_result(result: ItemWriteResult):
+            if result.success:
+                self.logger(f"Successfully updated item {result.manage_number}.")
+                successful_items.append(result.manage_number)
+                self._on_item_updated(result.manage_number)
+            else:
+                self.logger(f"Failed to update item {result.manage_number}. Error: {result.error}")
+                failed_items[result.manage_number] = result.error
 
-            variants = item.get("variants", {})
-            if not variants:
-                self.logger(f"Skipping item {manage_number} as it has no variants.")
+        BatchWriteExecutor(self.item_handler.patch_item, max_workers=self.max_workers).run(
+            self._iter_payloads(item_ids, failed_items), on_result=log_result
+        )
+
+        self._log_summary(len(item_ids), successful_items, failed_items)
+
+    def _iter_payloads(
+            self, item_ids: List[str], failed_items: Dict[str, str]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """逐組下載商品並 yield (manage_number, payload)；下載失敗的商品記在 failed_items。"""
+        self.logger(f"Fetching {len(item_ids)} items in chunks of {self.chunk_size}...")
+        chunks = self.item_handler.iter_bulk_get_chunks(item_ids, chunk_size=self.chunk_size, max_workers=2)
+        for chunk, items, error in chunks:
+            if error is not None:
+                for manage_number in chunk:
+                    failed_items[manage_number] = f"Failed to fetch item. Error: {error}"
                 continue
+            self.logger(f"Found {len(items)} of {len(chunk)} items in chunk starting at {chunk[0]}.")
+            yield from self._build_chunk_payloads(items)
 
-            self.logger(f"Processing item: {manage_number}")
+    def _on_item_updated(self, manage_number: str):
+        """商品 patch 成功後呼叫（呼叫端執行緒）。"""
 
-            patch_payload = self._process_item_variants(variants)
+    def _build_chunk_payloads(self, items: List[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """逐一計算一組商品的 patch payload；子類別可改為整組一次計算。"""
+        for item in items:
+            payload = self._build_item_payload(item)
+            if payload is not None:
+                yield item["manageNumber"], payload
 
-            if not patch_payload.get("variants"):
-                self.logger(f"No variants to update for item {manage_number}.")
-                continue
+    def _build_item_payload(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """計算單一商品的 patch payload；不需要更新時回傳 None。"""
+        manage_number = item.get("manageNumber")
+        if not manage_number:
+            return None
 
-            try:
-                self.logger(f"Updating item {manage_number}...")
-                self.item_handler.patch_item(manage_number, patch_payload)
-                self.logger(f"Successfully updated item {manage_number}.")
-                successful_items.append(manage_number)
-            except Exception as e:
-                error_message = f"Failed to update item {manage_number}. Error: {e}"
-                self.logger(error_message)
-                failed_items[manage_number] = str(e)
+        variants = item.get("variants", {})
+        if not variants:
+            self.logger(f"Skipping item {manage_number} as it has no variants.")
+            return None
 
-        self._log_summary(len(item_ids), successful_items, failed_items)
+        self.logger(f"Processing item: {manage_number}")
+
+        patch_payload = self._process_item_variants(variants)
+
+        if not patch_payload.get("variants"):
+            self.logger(f"No variants to update for item {manage_number}.")
+            return None
+        return patch_payload
 
     def _process_item_variants(self, variants: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -74,53 +117,105 @@ class BasePriceFlow:
 class PriceUpdater(BasePriceFlow):
     """
     Updates the standard and reference prices for all variants
-    of specified items based on a given discount multiplier.
+    of specified items based on a price rule set (by default one global discount multiplier).
+    Each fetched chunk is priced at once by PriceRuleEngine.
     """
 
-    def __init__(self, auth_token: str, discount: float, logger=print):
-        super().__init__(auth_token, logger)
-        if not (0 < discount <= 1):
-            raise ValueError("Discount must be between 0 and 1 (e.g., 0.8 for 80%).")
-        self.discount = discount
-
-    def _process_item_variants(self, variants: Dict[str, Any]) -> Dict[str, Any]:
-        patch_payload = {"variants": {}}
-        for variant_id, variant_details in variants.items():
-            try:
-                reference_price_value = variant_details.get("referencePrice", {}).get("value")
-                original_price_str = reference_price_value or variant_details.get("standardPrice")
-
-                if original_price_str is None:
-                    self.logger(f"  - Variant {variant_id}: Could not determine original price. Skipping.")
-                    continue
-
-                original_price = int(original_price_str)
-                new_price = str(math.floor(original_price * self.discount))
+    def __init__(self, auth_token: str, discount: float = 1.0, logger=print,
+                 rules: Optional[PriceRuleSet] = None, snapshot_store: Optional[PriceSnapshotStore] = None,
+                 **kwargs):
+        super().__init__(auth_token, logger, **kwargs)
+        self.snapshot_store = snapshot_store if snapshot_store is not None else PriceSnapshotStore()
+        self.rules = rules or PriceRuleSet(discount=discount)
+        self.discount = self.rules.discount
+        self.engine = PriceRuleEngine(self.rules)
 
+    def preview(self, item_ids: List[str]) -> pd.DataFrame:
+        """
+        不寫入任何資料，回傳所有 SKU 的價格預覽表（原價、折扣、新價格、略過原因）。
+        """
+        items, fetch_failures = self.item_handler.bulk_get_item_with_failures(
+            manage_numbers=item_ids, chunk_size=self.chunk_size
+        )
+        if fetch_failures:
+            self.logger(f"Failed to fetch {len(fetch_failures)} items; they are not included in the preview.")
+        return self.engine.apply(variants_to_frame(items))
+
+    def _build_chunk_payloads(self, items: List[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        preview = self.engine.apply(variants_to_frame(items))
+        payloads = build_patch_payloads(preview)
+
+        rows = zip(preview["manage_number"], preview["variant_id"], preview["original_price"],
+                   preview["new_price"], preview["skip_reason"])
+        current = None
+        for manage_number, variant_id, original_price, new_price, skip_reason in rows:
+            if manage_number != current:
+                current = manage_number
+                self.logger(f"Processing item: {manage_number}")
+            if skip_reason:
+                self.logger(f"  - Variant {variant_id}: {skip_reason}. Skipping.")
+            else:
                 self.logger(f"  - Variant {variant_id}: {original_price} -> {new_price}")
 
-                variant_patch = {
-                    "standardPrice": new_price,
-                    "referencePrice": {
-                        "displayType": "REFERENCE_PRICE",
-                        "type": 1,
-                        "value": str(original_price)
-                    }
-                }
-                patch_payload["variants"][variant_id] = variant_patch
+        # 寫入前先保存原始價格，還原時不需要再讀取商品
+        self.snapshot_store.save(
+            (item["manageNumber"], variant_id, variant.get("standardPrice"), variant.get("referencePrice"))
+            for item in items if item.get("manageNumber") in payloads
+            for variant_id, variant in item["variants"].items()
+            if variant_id in payloads[item["manageNumber"]]["variants"]
+        )
 
-            except (ValueError, TypeError) as e:
-                self.logger(f"  - Could not process price for variant {variant_id}. Error: {e}. Skipping.")
+        for item in items:
+            manage_number = item.get("manageNumber")
+            if not manage_number:
                 continue
-        return patch_payload
+            if not item.get("variants"):
+                self.logger(f"Skipping item {manage_number} as it has no variants.")
+            elif manage_number not in payloads:
+                self.logger(f"No variants to update for item {manage_number}.")
+            else:
+                yield manage_number, payloads[manage_number]
 
 
 class PriceReversion(BasePriceFlow):
     """
-    Reverts the price of item variants by setting the referencePrice
+    Reverts the price of item variants.
+    Items with a snapshot saved by PriceUpdater get their original standard/reference prices
+    back without being read again. Other items are read and reverted by setting the referencePrice
     as the new standardPrice and removing the referencePrice.
     """
 
+    def __init__(self, auth_token: str, logger=print, snapshot_store: Optional[PriceSnapshotStore] = None,
+                 **kwargs):
+        super().__init__(auth_token, logger, **kwargs)
+        self.snapshot_store = snapshot_store if snapshot_store is not None else PriceSnapshotStore()
+
+    def _iter_payloads(
+            self, item_ids: List[str], failed_items: Dict[str, str]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        snapshots = self.snapshot_store.get_snapshots(item_ids)
+        if snapshots:
+            self.logger(f"Restoring {len(snapshots)} items from price snapshots...")
+        for manage_number, variants in snapshots.items():
+            self.logger(f"Processing item: {manage_number}")
+            patch_payload = {"variants": {}}
+            for variant_id, (standard_price, reference_price) in variants.items():
+                self.logger(f"  - Variant {variant_id}: Reverting to {standard_price}")
+                patch_payload["variants"][variant_id] = {
+                    "standardPrice": standard_price,
+                    "referencePrice": reference_price
+                }
+            yield manage_number, patch_payload
+
+        missing = [manage_number for manage_number in item_ids if manage_number not in snapshots]
+        if missing:
+            self.logger(f"No price snapshot for {len(missing)} items, reverting them from referencePrice.")
+            yield from super()._iter_payloads(missing, failed_items)
+
+    def _on_item_updated(self, manage_number: str):
+        # 還原完成的商品不再需要快照，下次更新價格時重新記錄
+        self.snapshot_store.delete([manage_number])
+
     def _process_item_variants(self, variants: Dict[str, Any]) -> Dict[str, Any]:
         patch_payload = {"variants": {}}
         for variant_id, variant_details in variants.items():
@@ -0,0 +1,99 @@
+import asyncio
+from typing import List, Dict, Optional
+
+from env_settings import EnvSettings
+from handlers.category_handler import CategoryHandler
+from handlers.inventory_handler import InventoryHandler
+from handlers.item_handler import ItemHandler
+from handlers.rms_client import RMSClient
+
+env_settings = EnvSettings()
+
+
+class AsyncRMSHandler:
+    """
+    Base class for the asyncio siblings of the RMS handlers.
+    Each call runs the blocking handler method in a worker thread (sharing the pooled
+    RMSClient), while the semaphore caps how many requests are in flight at once.
+    Pass the same semaphore to several handlers to share one limit between them.
+    Wrapped methods that fetch several pages or chunks are called with max_workers=1,
+    so one semaphore slot never has more than one request in flight.
+    """
+
+    def __init__(self, semaphore: Optional[asyncio.Semaphore] = None, max_in_flight: Optional[int] = None):
+        self.semaphore = semaphore or asyncio.Semaphore(max_in_flight or env_settings.RMS_MAX_IN_FLIGHT)
+
+    async def _run(self, func, *args, **kwargs):
+        async with self.semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+
+class AsyncItemHandler(AsyncRMSHandler):
+    def __init__(
+            self,
+            auth_token: str,
+            client: Optional[RMSClient] = None,
+            semaphore: Optional[asyncio.Semaphore] = None,
+            max_in_flight: Optional[int] = None,
+    ):
+        super().__init__(semaphore, max_in_flight)
+        self.handler = ItemHandler(auth_token, client=client)
+
+    async def search_item(self, params: dict, page_size: int = 100, max_page: int = 10) -> List[Dict]:
+        return await self._run(self.handler.search_item, params, page_size, max_page, max_workers=1)
+
+    async def get_item(self, manage_number: str) -> dict:
+        return await self._run(self.handler.get_item, manage_number)
+
+    async def patch_item(self, manage_number, payload):
+        return await self._run(self.handler.patch_item, manage_number, payload)
+
+    async def bulk_get_item(self, manage_numbers: list) -> List[Dict]:
+        return await self._run(self.handler.bulk_get_item, manage_numbers, max_workers=1)
+
+    async def upsert_item(self, manage_number: str, item: Dict):
+        return await self._run(self.handler.upsert_item, manage_number, item)
+
+    async def delete_item(self, manage_number: str):
+        return await self._run(self.handler.delete_item, manage_number)
+
+
+class AsyncInventoryHandler(AsyncRMSHandler):
+    def __init__(
+            self,
+            auth_token: str,
+            client: Optional[RMSClient] = None,
+            semaphore: Optional[asyncio.Semaphore] = None,
+            max_in_flight: Optional[int] = None,
+    ):
+        super().__init__(semaphore, max_in_flight)
+        self.handler = InventoryHandler(auth_token, client=client)
+
+    async def get_variant_list(self, manage_number: str) -> dict:
+        return await self._run(self.handler.get_variant_list, manage_number)
+
+    async def bulk_get_inventory(self, inventories: List[Dict]) -> dict:
+        return await self._run(self.handler.bulk_get_inventory, inventories)
+
+    async def bulk_upsert(self, inventories: List[Dict]):
+        return await self._run(self.handler.bulk_upsert, inventories)
+
+
+class AsyncCategoryHandler(AsyncRMSHandler):
+    def __init__(
+            self,
+            auth_token: str,
+            client: Optional[RMSClient] = None,
+            semaphore: Optional[asyncio.Semaphore] = None,
+            max_in_flight: Optional[int] = None,
+    ):
+        super().__init__(semaphore, max_in_flight)
+        self.handler = CategoryHandler(auth_token, client=client)
+
+    async def get_category_mapping(self, manage_number, include_breadcrumb=False):
+        return await self._run(self.handler.get_category_mapping, manage_number, include_breadcrumb)
+
+    async def update_category_mapping(self, manage_number, category_ids, main_plural_category_id=None):
+        return await self._run(
+            self.handler.update_category_mapping, manage_number, category_ids, main_plural_category_id
+        )
@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+import requests
+from pydantic import BaseModel, Field
+
+
+class ItemWriteResult(BaseModel):
+    manage_number: str
+    success: bool
+    error: Optional[str] = None
+    attempts: int = 1
+
+
+class BatchWriteReport(BaseModel):
+    successful: List[str] = Field(default_factory=list)
+    failed: Dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.successful) + len(self.failed)
+
+    def add(self, result: ItemWriteResult):
+        if result.success:
+            self.successful.append(result.manage_number)
+        else:
+            self.failed[result.manage_number] = result.error
+
+
+class BatchWriteExecutor:
+    """
+    Runs a per-item write call (e.g. ItemHandler.patch_item) over a bounded worker pool.
+    429/5xx are already retried by RMSClient, so here only connection errors and timeouts
+    are retried; other errors fail the item immediately.
+    Results are yielded on the caller's thread, so callbacks can safely update Streamlit widgets.
+    """
+
+    def __init__(
+            self,
+            write_func: Callable[[str, Dict], Any],
+            max_workers: int = 4,
+            max_retries: int = 2,
+            retry_delay: float = 1.0,
+    ):
+        self.write_func = write_func
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def _write(self, manage_number: str, payload: Dict) -> ItemWriteResult:
+        attempt = 1
+        while True:
+            try:
+                self.write_func(manage_number, payload)
+                return ItemWriteResult(manage_number=manage_number, success=True, attempts=attempt)
+            except requests.exceptions.HTTPError as e:
+                error_message = f"{e.response.status_code} {e.response.text}"
+                return ItemWriteResult(manage_number=manage_number, success=False, error=error_message,
+                                       attempts=attempt)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt > self.max_retries:
+                    return ItemWriteResult(manage_number=manage_number, success=False, error=str(e),
+                                           attempts=attempt)
+                time.sleep(self.retry_delay * (2 ** (attempt - 1)))
+                attempt += 1
+            except Exception as e:
+                return ItemWriteResult(manage_number=manage_number, success=False, error=str(e), attempts=attempt)
+
+    def iter_results(
+            self, payloads: Union[Mapping[str, Dict], Iterable[Tuple[str, Dict]]]
+    ) -> Iterator[ItemWriteResult]:
+        """
+        依完成順序 yield 每個商品的結果；同時送出的請求不超過 max_workers * 2，payloads 可以是 iterator。
+        """
+        pairs = iter(payloads.items() if isinstance(payloads, Mapping) else payloads)
+        max_pending = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    try:
+                        manage_number, payload = next(pairs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.add(executor.submit(self._write, manage_number, payload))
+
+                if not pending:
+                    return
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def run(
+            self,
+            payloads: Union[Mapping[str, Dict], Iterable[Tuple[str, Dict]]],
+            on_result: Optional[Callable[[ItemWriteResult], None]] = None,
+    ) -> BatchWriteReport:
+        report = BatchWriteReport()
+        for result in self.iter_results(payloads):
+            report.add(result)
+            if on_result:
+                on_result(result)
+        return report
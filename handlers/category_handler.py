@@ -1,14 +1,12 @@
 import json
+from typing import Optional
 
-import requests
+from handlers.rms_client import RMSClient, get_default_client
 
 
 class CategoryHandler:
-    def __init__(self, auth_token):
-        self.headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json"
-        }
+    def __init__(self, auth_token, client: Optional[RMSClient] = None):
+        self.client = client or get_default_client(auth_token)
         self.base_url = "https://api.rms.rakuten.co.jp/es/2.0/categories/item-mappings/manage-numbers/"
 
     def get_category_mapping(self, manage_number, include_breadcrumb=False):
@@ -21,7 +19,7 @@ class CategoryHandler:
 
         url = f"{self.base_url}{manage_number}"
 
-        response = requests.get(url, headers=self.headers, params=json.dumps(params))
+        response = self.client.get(url, params=json.dumps(params))
         response.raise_for_status()
         return response.json()
 
@@ -36,5 +34,5 @@ class CategoryHandler:
             payload["mainPluralCategoryId"] = main_plural_category_id
 
         url = f"{self.base_url}{manage_number}"
-        response = requests.put(url, headers=self.headers, json=payload)
+        response = self.client.put(url, json=payload)
         response.raise_for_status()
@@ -1,17 +1,94 @@
 import json
 import re
 from io import BytesIO
+from typing import Iterable
 
 import pandas as pd
+from openpyxl import load_workbook
 
 from env_settings import EnvSettings
 
 env_settings = EnvSettings()
 
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+class _TextBlock:
+    """串流模式：「商品詳細介紹」<圖片無文字>、簡短介紹、5大賣點，收集 C 欄文字直到下一個標題。"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.lines = []
+
+    def feed(self, row: tuple, is_header: bool) -> bool:
+        if is_header:
+            return False
+        if len(row) > 2 and row[2] is not None:
+            self.lines.append(row[2])
+        return True
+
+    def close(self, product: dict):
+        product[self.field] = "\n".join(self.lines)
+
+
+class _ImageBlock:
+    """串流模式：「商品詳細介紹」<圖片含文字>，每一列圖片檔名直接加入 image_infos。"""
+
+    def __init__(self, cabinet_prefix: str, image_infos: list):
+        self.cabinet_prefix = cabinet_prefix
+        self.image_infos = image_infos
+
+    def feed(self, row: tuple, is_header: bool) -> bool:
+        a_val = row[0] if row else None
+        if is_header or a_val is None or not a_val.lower().endswith(IMAGE_EXTENSIONS):
+            return False
+        key = a_val.split("\n")[0].strip()
+        self.image_infos.append(dict(
+            image_url=f"{self.cabinet_prefix}/{key}",
+            description=row[2] if len(row) > 2 else None,
+            link=row[3] if len(row) > 3 else None
+        ))
+        return True
+
+    def close(self, product: dict):
+        pass
+
+
+class _ProductInfoBlock:
+    """串流模式：「商品詳細資訊」，A 欄為欄位名、C 欄為值，直接累加到 product_info。"""
+
+    def __init__(self, field_mapping: dict, product_info: dict):
+        self.field_mapping = field_mapping
+        self.product_info = product_info
+
+    def feed(self, row: tuple, is_header: bool) -> bool:
+        if is_header:
+            return False
+        if len(row) > 2 and row[2] is not None:
+            # A 欄空白時與 pandas 模式相同，欄位名為 "nan"
+            key = str(row[0] if row[0] is not None else float("nan")).split("\n")[0].strip()
+            key = self.field_mapping.get(key, key)
+            if key in self.product_info:
+                self.product_info[key] += f"\n{row[2]}"
+            else:
+                self.product_info[key] = row[2]
+        return True
+
+    def close(self, product: dict):
+        pass
+
 
 class ProductExcelParser:
-    def __init__(self, shop_code: str, excel_bytes: bytes):
-        self.xls = self.xls = pd.ExcelFile(BytesIO(excel_bytes))
+    def __init__(self, shop_code: str, excel_bytes: bytes, streaming: bool = False):
+        """
+        Args:
+            streaming: 以 openpyxl read-only 模式逐列讀取「文案」工作表，不建立 DataFrame。
+                結果與 pandas 模式相同，但儲存格內容保持原樣：只有數字的欄位不會變成浮點數
+                （5 而不是 5.0），"NA"、"None" 等字串也不會被當成空白。
+        """
+        self.streaming = streaming
+        self.excel_bytes = excel_bytes
+        self.xls = None if streaming else pd.ExcelFile(BytesIO(excel_bytes))
         self.known_headers = [
             "商品圖片名稱",
             "「商品詳細介紹」<圖片含文字>",
@@ -114,7 +191,82 @@ class ProductExcelParser:
             "product_info": product_info
         }
 
+    @staticmethod
+    def _clean_row(row: tuple) -> tuple:
+        """與 pandas 模式相同的清理：整數值的浮點數轉成整數、轉字串並去除零寬空白與前後空白，去掉列尾空白儲存格。"""
+        cells = []
+        for value in row:
+            if value is not None:
+                if isinstance(value, float) and value.is_integer():
+                    value = int(value)
+                value = str(value).replace("\u200b", "").strip()
+            cells.append(value)
+        while cells and cells[-1] is None:
+            cells.pop()
+        return tuple(cells)
+
+    def parse_rows(self, sheet_name: str, rows: Iterable[tuple]) -> dict:
+        """
+        串流模式：逐列處理一個工作表，每一列只看一次；區塊內容在讀到該列時就加入結果。
+        與 parse_sheet 相同，標題列之後的每一列都交給尚未結束的區塊，直到遇到下一個標題。
+        """
+        product = {
+            "sequence": self.sheet_to_sequence(sheet_name),
+            "image_infos": [],
+            "description": None,
+            "feature": None,
+            "highlight": "",
+            "product_info": {},
+        }
+        width = 0
+        active_blocks = []
+        for row in rows:
+            row = self._clean_row(row)
+            width = max(width, len(row))
+            val = row[0] if row and row[0] is not None else ""
+            is_header = any(header in val for header in self.known_headers)
+
+            still_active = []
+            for block in active_blocks:
+                if block.feed(row, is_header):
+                    still_active.append(block)
+                else:
+                    block.close(product)
+            active_blocks = still_active
+
+            if "「商品詳細介紹」<圖片含文字>" in val:
+                active_blocks.append(_ImageBlock(self.cabinet_prefix, product["image_infos"]))
+            elif "「商品詳細介紹」<圖片無文字>" in val:
+                active_blocks.append(_TextBlock("description"))
+            elif "「商品簡短介紹」" in val:
+                active_blocks.append(_TextBlock("feature"))
+            elif "「商品5大賣點」" in val:
+                active_blocks.append(_TextBlock("highlight"))
+            elif "「商品詳細資訊」" in val:
+                active_blocks.append(_ProductInfoBlock(self.field_mapping, product["product_info"]))
+
+        for block in active_blocks:
+            block.close(product)
+        if width < 3:
+            return {}
+        return product
+
+    def _parse_all_sheets_streaming(self) -> list[dict]:
+        products = []
+        workbook = load_workbook(BytesIO(self.excel_bytes), read_only=True, data_only=True)
+        try:
+            for sheet in workbook.sheetnames:
+                if "文案" in sheet:
+                    if product := self.parse_rows(sheet, workbook[sheet].iter_rows(values_only=True)):
+                        products.append(product)
+        finally:
+            workbook.close()
+        return products
+
     def parse_all_sheets(self) -> list[dict]:
+        if self.streaming:
+            return self._parse_all_sheets_streaming()
+
         products = []
         for sheet in self.xls.sheet_names:
             if "文案" in sheet:
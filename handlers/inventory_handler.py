@@ -1,15 +1,16 @@
 import json
-import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from handlers.rms_client import RMSClient, get_default_client
 
 
 class InventoryHandler:
-    def __init__(self, auth_token: str):
+    BULK_GET_LIMIT = 1000  # bulk_get_inventory 每次最多筆數
+    BULK_UPSERT_LIMIT = 400  # bulk_upsert 每次最多筆數
+
+    def __init__(self, auth_token: str, client: Optional[RMSClient] = None):
         self.base_url = "https://api.rms.rakuten.co.jp/es/2.1/inventories"
-        self.headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json"
-        }
+        self.client = client or get_default_client(auth_token)
 
     def get_variant_list(self, manage_number: str) -> dict:
         """
@@ -22,7 +23,7 @@ class InventoryHandler:
             dict: 包含 SKU 管理編號的庫存資訊。
         """
         url = f"{self.base_url}/variant-lists/manage-numbers/{manage_number}"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
         response.raise_for_status()
         return response.json()
 
@@ -41,7 +42,7 @@ class InventoryHandler:
         payload = {
             "inventories": inventories
         }
-        response = requests.post(url, headers=self.headers, data=json.dumps(payload))
+        response = self.client.post(url, data=json.dumps(payload))
         response.raise_for_status()
         return response.json()
 
@@ -68,6 +69,6 @@ class InventoryHandler:
         payload = {
             "inventories": inventories
         }
-        response = requests.post(url, headers=self.headers, data=json.dumps(payload))
+        response = self.client.post(url, data=json.dumps(payload))
 
         response.raise_for_status()
@@ -1,64 +1,107 @@
 import json
-from typing import List, Dict
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple, Type
 
 import requests
+from pydantic import BaseModel
 
 from env_settings import EnvSettings
+from handlers.rms_client import RMSClient, get_default_client
+from models.item import ProductData
 
 env_settings = EnvSettings()
 
 
+class BulkGetError(requests.exceptions.HTTPError):
+    """bulk-get 有部分 chunk 失敗；failures 為 {manage_number: 錯誤訊息}。"""
+
+    def __init__(self, failures: Dict[str, str]):
+        self.failures = failures
+        super().__init__(f"bulk-get failed for {len(failures)} items: {', '.join(failures)}")
+
+
 class ItemHandler:
-    def __init__(self, auth_token: str):
+    def __init__(self, auth_token: str, client: Optional[RMSClient] = None):
         self.base_url = "https://api.rms.rakuten.co.jp/es/2.0/items"
-        self.headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json"
-        }
+        self.client = client or get_default_client(auth_token)
 
-    def search_item(self, params: dict, page_size: int = 100, max_page: int = 10) -> List[Dict]:
+    def _search_page(self, params: dict, page_size: int, offset: int) -> dict:
         url = f"{self.base_url}/search"
+        page_params = dict(params, hits=page_size, offset=offset)
+        resp = self.client.get(url, params=page_params)
+        resp.raise_for_status()
+        return resp.json()
 
+    def iter_search_pages(
+            self, params: dict, page_size: int = 100, max_page: int = 10, max_workers: int = 4
+    ) -> Iterator[List[Dict]]:
+        """
+        逐頁 yield 搜尋結果 (results)，呼叫端可以邊抓邊處理，不需要把整份商品目錄留在記憶體。
+        第一頁取得總筆數 (numFound) 後，最多預先抓取 max_workers 頁，仍依頁序 yield。
+        """
+        first_page = self._search_page(params, page_size, 0)
+        items = first_page.get("results", [])
+        if not items:
+            return
+        yield items
+
+        # 第一頁就不滿一頁，代表已經抓完
+        if len(items) < page_size:
+            return
+
+        num_found = first_page.get("numFound")
+        if num_found is None:
+            page_count = max_page
+        else:
+            page_count = min(max_page, math.ceil(num_found / page_size))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            next_page = 1
+            while next_page < page_count or pending:
+                while next_page < page_count and len(pending) < max_workers:
+                    pending.append(executor.submit(self._search_page, params, page_size, next_page * page_size))
+                    next_page += 1
+
+                items = pending.popleft().result().get("results", [])
+                if not items:  # 沒有更多資料就結束
+                    break
+                yield items
+
+                # 如果本頁數量小於 page_size，也代表已經抓完
+                if len(items) < page_size:
+                    break
+
+    def iter_search_products(
+            self, params: dict, page_size: int = 100, max_page: int = 10, max_workers: int = 4,
+            product_model: Type[BaseModel] = ProductData,
+    ) -> Iterator[ProductData]:
+        """
+        與 iter_search_pages 相同，但逐筆 yield 解析後的商品；每頁的原始 dict 解析完即釋放。
+        product_model 可改用只有部分欄位的 model（例如 CampaignProductData），須提供 from_api。
+        """
+        for items in self.iter_search_pages(params, page_size, max_page, max_workers):
+            for item in items:
+                yield product_model.from_api(item.get("item"))
+
+    def search_item(self, params: dict, page_size: int = 100, max_page: int = 10, max_workers: int = 4) -> List[Dict]:
         results = []
-
-        # 確保每頁筆數固定
-        params.update({"hits": page_size})
-
-        for page in range(max_page):
-            offset = page * page_size
-            params.update({"offset": offset})
-
-            resp = requests.get(
-                url,
-                params=params,
-                headers=self.headers
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            # 拿到 results
-            items = data.get("results", [])
-            if not items:  # 沒有更多資料就結束
-                break
-
+        for items in self.iter_search_pages(params, page_size, max_page, max_workers):
             results.extend(items)
-
-            # 如果本頁數量小於 page_size，也代表已經抓完
-            if len(items) < page_size:
-                break
-
         return results
 
     def get_item(self, manage_number: str) -> dict:
         url = f"{self.base_url}/manage-numbers/{manage_number}"
-        resp = requests.get(url, headers=self.headers)
+        resp = self.client.get(url)
         resp.raise_for_status()
 
         return resp.json()
 
     def patch_item(self, manage_number, payload):
         url = f"{self.base_url}/manage-numbers/{manage_number}"
-        resp = requests.patch(url, headers=self.headers, data=json.dumps(payload))
+        resp = self.client.patch(url, data=json.dumps(payload))
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -67,29 +110,78 @@ class ItemHandler:
             raise
         return resp
 
-    def bulk_get_item(self, manage_numbers: list) -> List[Dict]:
-        results = []
+    def _bulk_get_chunk(self, manage_numbers: list) -> List[Dict]:
         url = f"{self.base_url}/bulk-get"
-        chunk_size = 50
-
-        for i in range(0, len(manage_numbers), chunk_size):
-            chunk = manage_numbers[i:i + chunk_size]
-            data = {"manageNumbers": chunk}
-            resp = requests.post(url, headers=self.headers, data=json.dumps(data))
-            resp.raise_for_status()
-            results.extend(resp.json().get("results", []))
-
+        data = {"manageNumbers": manage_numbers}
+        resp = self.client.post(url, data=json.dumps(data))
+        resp.raise_for_status()
+        return resp.json().get("results", [])
+
+    def iter_bulk_get_chunks(
+            self, manage_numbers: list, chunk_size: int = 50, max_workers: int = 4
+    ) -> Iterator[Tuple[List[str], List[Dict], Optional[str]]]:
+        """
+        以 chunk_size 筆為一組送出 bulk-get，依原順序逐組 yield (chunk, results, error)。
+        最多預先抓取 max_workers 組，呼叫端處理第 N 組時第 N+1 組已在下載中。
+        單一 chunk 失敗時 results 為空列表、error 為錯誤訊息，不影響其他 chunk。
+        """
+        chunks = deque(manage_numbers[i:i + chunk_size] for i in range(0, len(manage_numbers), chunk_size))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            while chunks or pending:
+                while chunks and len(pending) < max_workers:
+                    chunk = chunks.popleft()
+                    pending.append((chunk, executor.submit(self._bulk_get_chunk, chunk)))
+
+                chunk, future = pending.popleft()
+                try:
+                    yield chunk, future.result(), None
+                except requests.exceptions.HTTPError as e:
+                    error_message = f"{e.response.status_code} {e.response.text}"
+                    print(f"Error bulk-getting {len(chunk)} items starting at {chunk[0]}: {error_message}")
+                    yield chunk, [], error_message
+                except requests.exceptions.RequestException as e:
+                    print(f"Error bulk-getting {len(chunk)} items starting at {chunk[0]}: {e}")
+                    yield chunk, [], str(e)
+
+    def bulk_get_item_with_failures(
+            self, manage_numbers: list, chunk_size: int = 50, max_workers: int = 4
+    ) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        以 chunk_size 筆為一組同時送出 bulk-get，結果依原順序合併。
+        單一 chunk 失敗不會中斷其他 chunk，該 chunk 的每個商品管理番号會記在 failures。
+
+        Returns:
+            (results, failures): failures 為 {manage_number: 錯誤訊息}。
+        """
+        results = []
+        failures = {}
+        for chunk, chunk_results, error in self.iter_bulk_get_chunks(manage_numbers, chunk_size, max_workers):
+            results.extend(chunk_results)
+            if error is not None:
+                failures.update({manage_number: error for manage_number in chunk})
+        return results, failures
+
+    def bulk_get_item(self, manage_numbers: list, max_workers: int = 4) -> List[Dict]:
+        """
+        任何一組 bulk-get 失敗就丟出 BulkGetError，不回傳不完整的結果；
+        需要部分結果時請改用 bulk_get_item_with_failures。
+        """
+        results, failures = self.bulk_get_item_with_failures(manage_numbers, max_workers=max_workers)
+        if failures:
+            raise BulkGetError(failures)
         return results
 
     def upsert_item(self, manage_number: str, item: Dict):
         url = f"{self.base_url}/manage-numbers/{manage_number}"
-        resp = requests.put(url, headers=self.headers, data=json.dumps(item))
+        resp = self.client.put(url, data=json.dumps(item))
         resp.raise_for_status()
         return resp
 
     def delete_item(self, manage_number: str):
         url = f"{self.base_url}/manage-numbers/{manage_number}"
-        resp = requests.delete(url, headers=self.headers)
+        resp = self.client.delete(url)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
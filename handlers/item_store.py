@@ -0,0 +1,129 @@
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Type
+
+from pydantic import BaseModel
+
+from env_settings import EnvSettings
+from models.item import ProductData
+
+env_settings = EnvSettings()
+_logger = logging.getLogger(__name__)
+
+
+class ItemStore:
+    """
+    Local SQLite copy of the RMS catalog, keyed by manageNumber.
+    sync() only pulls items updated since the last synced `updated` timestamp (watermark),
+    so building ProductData for a campaign no longer needs to page through the whole catalog.
+    """
+
+    # 搜尋結果依 updated 由舊到新排序，一次抓不完時可以從最後一筆的時間繼續
+    SEARCH_SORT = {"sortKey": "updated", "sortOrder": "asc"}
+
+    def __init__(self, db_path: Optional[Path] = None, logger: Optional[Callable[[str], None]] = None):
+        self.db_path = Path(db_path or env_settings.output_dir / "item_cache.sqlite3")
+        self.logger = logger or _logger.warning
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "manage_number TEXT PRIMARY KEY, updated TEXT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def get_watermark(self) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, conn: sqlite3.Connection, watermark: str):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('watermark', ?)", (watermark,))
+
+    def upsert_items(self, items: Iterable[dict]) -> Optional[str]:
+        """
+        寫入（或覆蓋）商品原始資料，回傳這批資料中最新的 updated 時間。
+        """
+        rows = [
+            (item["manageNumber"], item.get("updated"), json.dumps(item, ensure_ascii=False))
+            for item in items if item.get("manageNumber")
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO items (manage_number, updated, data) VALUES (?, ?, ?)", rows)
+        return max((updated for _, updated, _ in rows if updated), default=None)
+
+    def sync(self, item_handler, default_since: str, page_size: int = 100, max_page: int = 100) -> int:
+        """
+        從 RMS 拉取 watermark（沒有時用 default_since）之後更新過的商品並寫入本地。
+        一次搜尋最多 page_size * max_page 筆，抓滿時以這批最新的 updated 作為下一次的 updatedFrom 繼續，
+        直到抓完為止；每批抓完就移動 watermark，中途失敗下次也能從該處繼續。
+        RMS 的 updatedFrom 包含邊界，所以邊界時間點的商品會被重抓一次，覆蓋寫入不影響結果。
+        RMS 上已刪除的商品不會從本地移除。
+
+        Returns:
+            int: 本次同步的商品數量（含邊界重抓的商品）。
+        """
+        since = self.get_watermark() or default_since
+
+        count = 0
+        while True:
+            batch_count = 0
+            watermark = None
+            params = {"updatedFrom": since, **self.SEARCH_SORT}
+            for page in item_handler.iter_search_pages(params, page_size=page_size, max_page=max_page):
+                items = [result.get("item") or result for result in page]
+                latest = self.upsert_items(items)
+                batch_count += len(items)
+                if latest and (watermark is None or latest > watermark):
+                    watermark = latest
+            count += batch_count
+
+            if watermark and watermark > since:
+                with closing(self._connect()) as conn, conn:
+                    self._set_watermark(conn, watermark)
+            if batch_count < page_size * max_page:
+                break
+            if not watermark or watermark <= since:
+                # 同一時間點更新的商品超過一次可抓取的數量，無法再往後移動
+                self.logger(f"More than {page_size * max_page} items were updated at {since}; "
+                            f"items beyond that were not synced to the local cache.")
+                break
+            since = watermark
+        return count
+
+    def iter_raw_items(self, manage_numbers: Optional[List[str]] = None) -> Iterator[dict]:
+        with closing(self._connect()) as conn:
+            if manage_numbers is None:
+                cursor = conn.execute("SELECT data FROM items ORDER BY manage_number")
+                for (data,) in cursor:
+                    yield json.loads(data)
+            else:
+                for manage_number in manage_numbers:
+                    row = conn.execute("SELECT data FROM items WHERE manage_number = ?", (manage_number,)).fetchone()
+                    if row:
+                        yield json.loads(row[0])
+
+    def iter_products(
+            self, manage_numbers: Optional[List[str]] = None, product_model: Type[BaseModel] = ProductData
+    ) -> Iterator[ProductData]:
+        for item in self.iter_raw_items(manage_numbers):
+            yield product_model.from_api(item)
+
+    def clear(self):
+        """刪除所有快取資料與 watermark，下次 sync 會重新完整下載。"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM items")
+            conn.execute("DELETE FROM meta")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
@@ -1,17 +1,80 @@
-import unicodedata
+import string
 import re
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, List, Sequence, Tuple
 from models.item import ProductData
+from utils.display_width import get_display_width, get_display_widths
 
+_SPACE_BEFORE_BRACKET_RE = re.compile(r'([^\s])(【)')
+_BRACKETED_TEXT_RE = re.compile(r'【.*?】')
+_BRACKET_PLACEHOLDER_PREFIX = "__BRACKET_"
 
-def get_display_width(text: str) -> int:
-    width = 0
-    for char in text:
-        if unicodedata.east_asian_width(char) in ('F', 'W', 'A'):
-            width += 2
-        else:
-            width += 1
-    return width
+
+class CompiledFormat:
+    """
+    A format string split once around its placeholder (e.g. "{original_title}").
+    The formatted prefix/suffix are cached per distinct kwargs (point rate, campaign code, ...),
+    so applying the same format to many items only costs a startswith/endswith check and
+    one concatenation per item.
+    """
+
+    _FIELD_NAMES = ("original_title", "original_html")
+    _MAX_CACHED_FRAMES = 256
+
+    def __init__(self, format_string: str, placeholder: str):
+        self.format_string = format_string
+        self.placeholder = placeholder
+        self.placeholder_name = placeholder.strip("{}")
+
+        parts = re.split(re.escape(placeholder), format_string)
+        self.prefix_template = parts[0]
+        self.suffix_template = parts[1] if len(parts) > 1 else ""
+        self.has_placeholder = len(parts) > 1
+
+        # 只有 placeholder 最多出現一次、且沒有其他 original_* 欄位時，
+        # prefix + 內容 + suffix 才會與 format_string.format(...) 完全相同
+        content_fields = [
+            field_name for _, field_name, _, _ in string.Formatter().parse(format_string)
+            if field_name in self._FIELD_NAMES
+        ]
+        self.can_concatenate = len(parts) <= 2 and content_fields == (
+            [self.placeholder_name] if self.has_placeholder else []
+        )
+        self._frames: Dict[tuple, Tuple[str, str]] = {}
+
+    def frame(self, **kwargs) -> Tuple[str, str]:
+        """回傳以 kwargs 格式化後的 (prefix, suffix)。"""
+        key = tuple(kwargs.items())
+        try:
+            return self._frames[key]
+        except TypeError:  # kwargs 含有無法 hash 的值，不快取
+            key = None
+        except KeyError:
+            pass
+
+        temp_kwargs = {k: v for k, v in kwargs.items() if k != self.placeholder_name}
+        frame = (self.prefix_template.format(**temp_kwargs), self.suffix_template.format(**temp_kwargs))
+        if key is not None:
+            if len(self._frames) >= self._MAX_CACHED_FRAMES:
+                self._frames.clear()
+            self._frames[key] = frame
+        return frame
+
+    def apply(self, content: str, **kwargs) -> str:
+        """
+        content 已經包含格式化後的 prefix/suffix 時原樣回傳，否則套用格式。
+        """
+        prefix, suffix = self.frame(**kwargs)
+        if content.startswith(prefix) and content.endswith(suffix):
+            return content
+        if self.can_concatenate and not any(name in kwargs for name in self._FIELD_NAMES):
+            return prefix + content + suffix if self.has_placeholder else prefix
+        return self.format_string.format(original_title=content, original_html=content, **kwargs)
+
+
+@lru_cache(maxsize=64)
+def compile_format(format_string: str, placeholder: str) -> CompiledFormat:
+    return CompiledFormat(format_string, placeholder)
 
 
 class BaseContentGenerator:
@@ -38,20 +101,7 @@ class BaseContentGenerator:
         if formatter_func:
             processed_content = formatter_func(original_content=original_content, **kwargs)
 
-        # Define actual_prefix and actual_suffix here, before they are used
-        parts = re.split(re.escape(placeholder), format_string)
-        prefix_template = parts[0]
-        suffix_template = parts[1] if len(parts) > 1 else ""
-
-        temp_kwargs = {k: v for k, v in kwargs.items() if k != placeholder.strip("{}")}
-
-        actual_prefix = prefix_template.format(**temp_kwargs)
-        actual_suffix = suffix_template.format(**temp_kwargs)
-
-        if processed_content.startswith(actual_prefix) and processed_content.endswith(actual_suffix):
-            return processed_content
-        else:
-            return format_string.format(original_title=processed_content, original_html=processed_content, **kwargs)
+        return compile_format(format_string, placeholder).apply(processed_content, **kwargs)
 
 
 class TitleGenerator(BaseContentGenerator):
@@ -62,6 +112,30 @@ class TitleGenerator(BaseContentGenerator):
     def __init__(self, title_format: Optional[str] = None, max_width: int = 255):
         self.title_format = title_format
         self.max_width = max_width
+        # {kwargs: frame width}，frame 只與 title_format 和 kwargs（point_rate 等）有關
+        self._frame_widths: Dict[tuple, int] = {}
+
+    def _frame_width(self, **kwargs) -> int:
+        """
+        Width of the title format without the original title, cached per distinct kwargs.
+        """
+        try:
+            key = tuple(kwargs.items())
+            return self._frame_widths[key]
+        except TypeError:  # kwargs 含有無法 hash 的值，不快取
+            key = None
+        except KeyError:
+            pass
+
+        temp_title_for_frame = self.title_format.replace("{original_title}", "")
+        frame_text = temp_title_for_frame.format(original_title="", **kwargs)
+        frame_width = get_display_width(frame_text)
+        if key is not None:
+            # 與 CompiledFormat 相同，kwargs 種類過多（例如每個商品不同）時清空重來，避免無限成長
+            if len(self._frame_widths) >= CompiledFormat._MAX_CACHED_FRAMES:
+                self._frame_widths.clear()
+            self._frame_widths[key] = frame_width
+        return frame_width
 
     def _generate_and_trim_title(
             self, original_content: str, **kwargs
@@ -76,58 +150,67 @@ class TitleGenerator(BaseContentGenerator):
 
         # 1. Extract bracketed text and replace with placeholders
         bracketed_texts_map = {}
-        placeholder_counter = 0
 
         def replace_bracketed(match):
-            nonlocal placeholder_counter
-            placeholder = f"__BRACKET_{placeholder_counter}__"
+            placeholder = f"{_BRACKET_PLACEHOLDER_PREFIX}{len(bracketed_texts_map)}__"
             bracketed_texts_map[placeholder] = match.group(0)
-            placeholder_counter += 1
             return placeholder
 
         # Add a space before 【 to separate it from the previous word, if there's no space.
-        content_with_space_before_bracket = re.sub(r'([^\s])(【)', r'\1 \2', original_content)
-        content_with_placeholders = re.sub(r'【.*?】', replace_bracketed, content_with_space_before_bracket)
+        content_with_space_before_bracket = _SPACE_BEFORE_BRACKET_RE.sub(r'\1 \2', original_content)
+        content_with_placeholders = _BRACKETED_TEXT_RE.sub(replace_bracketed, content_with_space_before_bracket)
+
+        def restore_brackets(text: str) -> str:
+            if _BRACKET_PLACEHOLDER_PREFIX in text:
+                for placeholder, original_text in bracketed_texts_map.items():
+                    text = text.replace(placeholder, original_text)
+            return text
 
         # 2. Calculate the width of the "frame" (the format string without original_title)
-        temp_title_for_frame = self.title_format.replace("{original_title}", "")
-        frame_text = temp_title_for_frame.format(original_title="", **kwargs)
-        frame_width = get_display_width(frame_text)
+        frame_width = self._frame_width(**kwargs)
 
         # 3. Determine the max allowed width for the original title (including placeholders)
         allowed_title_width = self.max_width - frame_width
 
-        # 4. Trim the content by removing non-placeholder words from the end
-        words = content_with_placeholders.split(' ')
-        words = [w for w in words if w]  # remove empty strings
-
+        # 4. Trim the content by removing non-placeholder words from the end.
+        # Each word's width (with bracketed texts restored) is computed once; removing a word
+        # only updates a running total. Words starting with a placeholder are protected.
+        words = [w for w in content_with_placeholders.split(' ') if w]  # remove empty strings
+        word_widths = get_display_widths([restore_brackets(w) for w in words])
+        protected = [w.startswith(_BRACKET_PLACEHOLDER_PREFIX) for w in words]
+        kept = [True] * len(words)
+        kept_count = len(words)
+        kept_width_sum = sum(word_widths)
+
+        # The first check measures the text with placeholders, like the original implementation did
         current_width = get_display_width(' '.join(words))
 
+        last_trimmable = len(words) - 1
+        last_kept = len(words) - 1
         while current_width > allowed_title_width:
-            if not words:
+            if not kept_count:
                 break
 
             # Find the last word that is NOT a placeholder
-            last_trimmable_word_index = -1
-            for i in range(len(words) - 1, -1, -1):
-                if not words[i].startswith('__BRACKET_'):
-                    last_trimmable_word_index = i
-                    break
-
-            if last_trimmable_word_index != -1:
-                words.pop(last_trimmable_word_index)
+            while last_trimmable >= 0 and (protected[last_trimmable] or not kept[last_trimmable]):
+                last_trimmable -= 1
+
+            if last_trimmable >= 0:
+                index = last_trimmable
             else:
                 # All remaining words are placeholders, and it's still too long.
-                # Pop the last one to avoid an infinite loop.
-                words.pop()
+                # Remove the last one to avoid an infinite loop.
+                while not kept[last_kept]:
+                    last_kept -= 1
+                index = last_kept
 
-            # Recalculate current_width with actual bracketed texts for accurate trimming
-            temp_content_for_width_calc = ' '.join(words)
-            for placeholder, original_text in bracketed_texts_map.items():
-                temp_content_for_width_calc = temp_content_for_width_calc.replace(placeholder, original_text)
-            current_width = get_display_width(temp_content_for_width_calc)
+            kept[index] = False
+            kept_count -= 1
+            kept_width_sum -= word_widths[index]
+            # words joined by single half-width spaces
+            current_width = kept_width_sum + max(kept_count - 1, 0)
 
-        trimmed_content_with_placeholders = ' '.join(words)
+        trimmed_content_with_placeholders = ' '.join(w for w, keep in zip(words, kept) if keep)
 
         # 5. Reconstruct the title by replacing placeholders with original bracketed texts
         trimmed_original_title = trimmed_content_with_placeholders
@@ -244,3 +327,19 @@ class CampaignPayloadGenerator:
         ))
 
         return payload
+
+    def generate_batch(
+            self, products: Sequence[ProductData], item_kwargs: Optional[Sequence[Dict]] = None
+    ) -> List[Dict]:
+        """
+        Generates payloads for many products at once.
+        item_kwargs[i] holds the format kwargs (point_rate, campaign_code, ...) of products[i].
+        Formats and title frame widths are computed once per distinct kwargs (on first use)
+        and shared by the whole batch.
+        """
+        if item_kwargs is None:
+            item_kwargs = [{}] * len(products)
+        if len(item_kwargs) != len(products):
+            raise ValueError("item_kwargs must have one entry per product.")
+
+        return [self.generate(product, **kwargs) for product, kwargs in zip(products, item_kwargs)]
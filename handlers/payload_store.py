@@ -0,0 +1,139 @@
+import json
+import os
+import time
+import uuid
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from env_settings import EnvSettings
+
+env_settings = EnvSettings()
+
+
+class JsonlPayloadStore:
+    """
+    On-disk JSONL file of generated payloads, one {"manageNumber", "payload"} record per line.
+    A byte-offset index (8 bytes per record) is kept in memory, so a page of results can be
+    read with one seek and the update executor can stream records without loading the whole file.
+    """
+
+    # 預設路徑下超過這個時間沒有寫入或讀取的檔案視為已結束的 session 留下的，建立新 store 時刪除
+    STALE_AFTER_SECONDS = 24 * 60 * 60
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            payload_dir = env_settings.output_dir / "payloads"
+            payload_dir.mkdir(parents=True, exist_ok=True)
+            self.remove_stale_files(payload_dir)
+            path = payload_dir / f"{uuid.uuid4().hex}.jsonl"
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._offsets = array("q")
+        self._size = 0
+        if self.path.exists():
+            self._load_index()
+
+    @classmethod
+    def remove_stale_files(cls, directory: Path, max_age: Optional[float] = None) -> int:
+        """
+        刪除 directory 中超過 max_age 秒（預設 STALE_AFTER_SECONDS）沒有更新的 .jsonl 檔。
+
+        Returns:
+            int: 刪除的檔案數。
+        """
+        max_age = cls.STALE_AFTER_SECONDS if max_age is None else max_age
+        cutoff = time.time() - max_age
+        removed = 0
+        for file in Path(directory).glob("*.jsonl"):
+            try:
+                if file.stat().st_mtime < cutoff:
+                    file.unlink()
+                    removed += 1
+            except FileNotFoundError:  # 其他 session 同時刪除
+                continue
+        return removed
+
+    def _load_index(self):
+        """由既有檔案重建每一行的起始位置。"""
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):  # 中斷時寫了一半的最後一行不列入，下次寫入時覆蓋
+                    break
+                self._offsets.append(self._size)
+                self._size += len(line)
+
+    def write_all(self, payloads: Iterable[Tuple[str, Dict]]) -> int:
+        """
+        逐筆附加寫入 (manage_number, payload)，payloads 可以是 iterator。
+
+        Returns:
+            int: 本次寫入的筆數。
+        """
+        count = 0
+        if not self.path.exists():  # 被其他 session 清除時從頭寫起
+            self._offsets = array("q")
+            self._size = 0
+        with open(self.path, "r+b" if self.path.exists() else "wb") as f:
+            f.seek(self._size)
+            f.truncate()
+            for manage_number, payload in payloads:
+                line = json.dumps({"manageNumber": manage_number, "payload": payload}, ensure_ascii=False)
+                data = (line + "\n").encode("utf-8")
+                f.write(data)
+                self._offsets.append(self._size)
+                self._size += len(data)
+                count += 1
+        return count
+
+    def write(self, manage_number: str, payload: Dict):
+        self.write_all([(manage_number, payload)])
+
+    def _open_for_read(self):
+        """
+        開啟檔案讀取並更新 mtime，仍在使用的檔案不會被其他 session 當成過期檔刪除。
+        檔案已被刪除時清空 index 並回傳 None，視為空的 store。
+        """
+        try:
+            os.utime(self.path)
+            return open(self.path, "rb")
+        except FileNotFoundError:
+            self._offsets = array("q")
+            self._size = 0
+            return None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def read_page(self, start: int, count: int) -> Dict[str, Dict]:
+        """讀取第 start 筆起最多 count 筆，回傳 {manage_number: payload}。"""
+        end = min(start + count, len(self._offsets))
+        if start >= end:
+            return {}
+        f = self._open_for_read()
+        if f is None:
+            return {}
+        page = {}
+        with f:
+            f.seek(self._offsets[start])
+            for _ in range(end - start):
+                record = json.loads(f.readline())
+                page[record["manageNumber"]] = record["payload"]
+        return page
+
+    def iter_items(self) -> Iterator[Tuple[str, Dict]]:
+        """依寫入順序逐筆 yield (manage_number, payload)。"""
+        if not self._offsets:
+            return
+        f = self._open_for_read()
+        if f is None:
+            return
+        with f:
+            for _ in range(len(self._offsets)):
+                record = json.loads(f.readline())
+                yield record["manageNumber"], record["payload"]
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+        self._offsets = array("q")
+        self._size = 0
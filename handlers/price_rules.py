@@ -0,0 +1,183 @@
+from typing import Any, Dict, Iterable, Literal, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, field_validator
+
+PRICE_COLUMNS = ["manage_number", "variant_id", "standard_price", "reference_price"]
+
+
+class PriceRuleSet(BaseModel):
+    """
+    一次價格更新套用的規則。折扣的優先順序：per-SKU > per-item > 全體 discount。
+    計算順序：原價 × 折扣 → 依 rounding 取整到 round_to 的倍數 → 套用下限 (min_price, min_price_ratio)
+    → 套用上限 (max_price)。
+    """
+    discount: float = 1.0
+    # {manage_number: discount}
+    item_discounts: Dict[str, float] = Field(default_factory=dict)
+    # {manage_number: {variant_id: discount}}
+    sku_discounts: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    round_to: int = 1
+    rounding: Literal["floor", "ceil", "nearest"] = "floor"
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    # 新價格不得低於原價的這個比例（RMS 沒有成本資料，以此作為最低毛利的保護）
+    min_price_ratio: Optional[float] = None
+
+    @field_validator("discount")
+    @classmethod
+    def _check_discount(cls, value: float) -> float:
+        if not (0 < value <= 1):
+            raise ValueError("Discount must be between 0 and 1 (e.g., 0.8 for 80%).")
+        return value
+
+    @field_validator("item_discounts")
+    @classmethod
+    def _check_item_discounts(cls, value: Dict[str, float]) -> Dict[str, float]:
+        for manage_number, discount in value.items():
+            if not (0 < discount <= 1):
+                raise ValueError(f"Discount for {manage_number} must be between 0 and 1.")
+        return value
+
+    @field_validator("sku_discounts")
+    @classmethod
+    def _check_sku_discounts(cls, value: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        for manage_number, variants in value.items():
+            for variant_id, discount in variants.items():
+                if not (0 < discount <= 1):
+                    raise ValueError(f"Discount for {manage_number}/{variant_id} must be between 0 and 1.")
+        return value
+
+    @field_validator("round_to")
+    @classmethod
+    def _check_round_to(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("round_to must be a positive integer.")
+        return value
+
+
+def variants_to_frame(items: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    將 bulk-get 取得的商品展開成每個 SKU 一列的表格。
+    價格維持 API 的原始字串，轉換交給 PriceRuleEngine 一次處理。
+    """
+    manage_numbers, variant_ids, standard_prices, reference_prices = [], [], [], []
+    for item in items:
+        manage_number = item.get("manageNumber")
+        if not manage_number:
+            continue
+        for variant_id, variant in (item.get("variants") or {}).items():
+            manage_numbers.append(manage_number)
+            variant_ids.append(variant_id)
+            standard_prices.append(variant.get("standardPrice"))
+            reference_prices.append((variant.get("referencePrice") or {}).get("value"))
+
+    return pd.DataFrame({
+        "manage_number": pd.Series(manage_numbers, dtype=object),
+        "variant_id": pd.Series(variant_ids, dtype=object),
+        "standard_price": pd.Series(standard_prices, dtype=object),
+        "reference_price": pd.Series(reference_prices, dtype=object),
+    }, columns=PRICE_COLUMNS)
+
+
+class PriceRuleEngine:
+    """
+    以 pandas/NumPy 向量化運算套用 PriceRuleSet，數萬個 SKU 也只需一次表格運算。
+    原價與舊版相同：有 referencePrice 時用 referencePrice，否則用 standardPrice。
+    """
+
+    def __init__(self, rules: PriceRuleSet):
+        self.rules = rules
+
+    def apply(self, variants: pd.DataFrame) -> pd.DataFrame:
+        """
+        回傳預覽表：在輸入欄位之外加上 original_price, discount, new_price, skip_reason。
+        無法決定原價的 SKU new_price 為 NA，skip_reason 說明原因。
+        """
+        rules = self.rules
+        df = variants.copy()
+
+        # referencePrice 為 None 或空字串時改用 standardPrice
+        has_reference = df["reference_price"].fillna("").astype(str) != ""
+        original_raw = df["reference_price"].where(has_reference, df["standard_price"])
+        original = pd.to_numeric(original_raw, errors="coerce")
+        # 與 int() 相同，只接受整數價格
+        invalid = original.notna() & (original != np.floor(original))
+        original = original.mask(invalid)
+
+        df["original_price"] = original.astype("Int64")
+        df["discount"] = self._discounts(df)
+
+        raw_price = original.to_numpy(dtype=float) * df["discount"].to_numpy(dtype=float)
+        step = rules.round_to
+        if rules.rounding == "floor":
+            new_price = np.floor(raw_price / step) * step
+        elif rules.rounding == "ceil":
+            new_price = np.ceil(raw_price / step) * step
+        else:
+            new_price = np.floor(raw_price / step + 0.5) * step
+
+        discounted_price = new_price
+        if rules.min_price_ratio is not None:
+            lower = np.ceil(original.to_numpy(dtype=float) * rules.min_price_ratio / step) * step
+            new_price = np.fmax(new_price, lower)
+        if rules.min_price is not None:
+            new_price = np.fmax(new_price, rules.min_price)
+        if rules.max_price is not None:
+            new_price = np.fmin(new_price, rules.max_price)
+
+        # 下限把價格拉到原價以上時就不是特價（referencePrice 不高於售價），這些 SKU 不更新
+        floor_not_below_original = (new_price > discounted_price) & (new_price >= original.to_numpy(dtype=float))
+        new_price = np.where(np.isnan(raw_price) | floor_not_below_original, np.nan, new_price)
+        df["new_price"] = pd.Series(new_price, index=df.index).astype("Int64")
+
+        df["skip_reason"] = None
+        df.loc[floor_not_below_original, "skip_reason"] = "Minimum price is not below the original price"
+        df.loc[original_raw.isna(), "skip_reason"] = "Could not determine original price"
+        df.loc[original_raw.notna() & df["original_price"].isna(), "skip_reason"] = "Invalid price"
+        return df
+
+    def _discounts(self, df: pd.DataFrame) -> np.ndarray:
+        rules = self.rules
+        discounts = np.full(len(df), rules.discount, dtype=float)
+
+        if rules.item_discounts:
+            item_discounts = df["manage_number"].map(rules.item_discounts).to_numpy(dtype=float)
+            discounts = np.where(np.isnan(item_discounts), discounts, item_discounts)
+
+        if rules.sku_discounts:
+            sku_discounts = pd.Series({
+                (manage_number, variant_id): discount
+                for manage_number, variants in rules.sku_discounts.items()
+                for variant_id, discount in variants.items()
+            }, dtype=float)
+            index = pd.MultiIndex.from_arrays([df["manage_number"], df["variant_id"]])
+            sku_values = sku_discounts.reindex(index).to_numpy(dtype=float)
+            discounts = np.where(np.isnan(sku_values), discounts, sku_values)
+
+        return discounts
+
+
+def build_patch_payloads(preview: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    由預覽表建立 {manage_number: patch payload}，略過無法計算新價格的 SKU。
+    payload 格式與 PriceUpdater 原本逐一產生的相同。
+    """
+    valid = preview[preview["new_price"].notna()]
+    payloads: Dict[str, Dict[str, Any]] = {}
+    for manage_number, variant_id, original_price, new_price in zip(
+            valid["manage_number"].tolist(), valid["variant_id"].tolist(),
+            valid["original_price"].to_numpy(dtype=np.int64).tolist(),
+            valid["new_price"].to_numpy(dtype=np.int64).tolist()
+    ):
+        variants = payloads.setdefault(manage_number, {"variants": {}})["variants"]
+        variants[variant_id] = {
+            "standardPrice": str(new_price),
+            "referencePrice": {
+                "displayType": "REFERENCE_PRICE",
+                "type": 1,
+                "value": str(original_price)
+            }
+        }
+    return payloads
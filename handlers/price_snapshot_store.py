@@ -0,0 +1,88 @@
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from env_settings import EnvSettings
+
+env_settings = EnvSettings()
+
+
+class PriceSnapshotStore:
+    """
+    Local SQLite record of each SKU's price before PriceUpdater changed it,
+    keyed by (manageNumber, variantId). PriceReversion restores prices from here without
+    reading the items again, and is not affected by reference prices edited during the sale.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or env_settings.output_dir / "price_snapshots.sqlite3")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS price_snapshots ("
+                "manage_number TEXT NOT NULL, variant_id TEXT NOT NULL, "
+                "standard_price TEXT, reference_price TEXT, recorded_at TEXT NOT NULL, "
+                "PRIMARY KEY (manage_number, variant_id))"
+            )
+
+    def save(self, rows: Iterable[Tuple[str, str, Any, Optional[Dict]]]) -> int:
+        """
+        寫入 (manage_number, variant_id, standardPrice, referencePrice) 快照。
+        SKU 已在特價中（有 referencePrice 的值）時不覆蓋既有快照，重複執行價格更新時仍保留最初的價格；
+        沒有 referencePrice 代表目前就是原價，覆蓋掉之前沒有還原（還原失敗或略過）留下的舊快照。
+
+        Returns:
+            int: 寫入的 SKU 數量。
+        """
+        recorded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        on_sale_records, original_price_records = [], []
+        for manage_number, variant_id, standard_price, reference_price in rows:
+            record = (manage_number, variant_id, standard_price,
+                      json.dumps(reference_price, ensure_ascii=False) if reference_price else None, recorded_at)
+            if reference_price and reference_price.get("value"):
+                on_sale_records.append(record)
+            else:
+                original_price_records.append(record)
+
+        columns = "(manage_number, variant_id, standard_price, reference_price, recorded_at) VALUES (?, ?, ?, ?, ?)"
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany(f"INSERT OR IGNORE INTO price_snapshots {columns}", on_sale_records)
+            conn.executemany(f"INSERT OR REPLACE INTO price_snapshots {columns}", original_price_records)
+            return conn.total_changes - before
+
+    def get_snapshots(self, manage_numbers: List[str]) -> Dict[str, Dict[str, Tuple[Any, Optional[Dict]]]]:
+        """
+        Returns:
+            {manage_number: {variant_id: (standardPrice, referencePrice)}}，沒有快照的商品不會出現。
+        """
+        snapshots: Dict[str, Dict[str, Tuple[Any, Optional[Dict]]]] = {}
+        with closing(self._connect()) as conn:
+            for manage_number in manage_numbers:
+                cursor = conn.execute(
+                    "SELECT variant_id, standard_price, reference_price FROM price_snapshots "
+                    "WHERE manage_number = ?", (manage_number,)
+                )
+                for variant_id, standard_price, reference_price in cursor:
+                    snapshots.setdefault(manage_number, {})[variant_id] = (
+                        standard_price, json.loads(reference_price) if reference_price else None
+                    )
+        return snapshots
+
+    def delete(self, manage_numbers: Iterable[str]):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM price_snapshots WHERE manage_number = ?",
+                             [(manage_number,) for manage_number in manage_numbers])
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM price_snapshots").fetchone()[0]
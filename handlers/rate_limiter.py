@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+# 需要退避重試的狀態碼：429 (流量限制) 與 5xx
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Blocks until one token is available, then consumes it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Per-endpoint request budgets for one RMS license key.
+    Budgets are requests per second, looked up by endpoint key
+    (e.g. "items/bulk-get"), then by API name (e.g. "items"), then the default.
+    """
+
+    def __init__(self, default_rate: float, budgets: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        self.budgets = budgets or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_key(url: str) -> str:
+        """
+        /es/2.0/items/manage-numbers/{id} -> items/manage-numbers
+        /es/2.1/inventories/bulk-get      -> inventories/bulk-get
+        """
+        segments = [s for s in urlparse(url).path.split("/") if s]
+        if len(segments) >= 2 and segments[0] == "es":
+            segments = segments[2:]
+        return "/".join(segments[:2])
+
+    def _bucket_for(self, key: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                api_name = key.split("/")[0]
+                rate = self.budgets.get(key) or self.budgets.get(api_name) or self.default_rate
+                bucket = TokenBucket(rate)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, url: str):
+        self._bucket_for(self.endpoint_key(url)).acquire()
+
+
+def parse_retry_after(response: requests.Response) -> Optional[float]:
+    """Reads Retry-After as either delay-seconds or an HTTP-date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+) -> float:
+    """
+    Retry-After 優先（最多等 max_delay 秒）；否則使用帶 jitter 的指數退避（attempt 從 0 開始）。
+    """
+    if response is not None:
+        retry_after = parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, max_delay)
+
+    cap = min(max_delay, base_delay * (2 ** attempt))
+    return cap / 2 + random.uniform(0, cap / 2)
@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from env_settings import EnvSettings
+from handlers.rate_limiter import RateLimiter, RETRY_STATUS_CODES, backoff_delay
+
+env_settings = EnvSettings()
+
+_logger = logging.getLogger(__name__)
+
+
+class RMSClient:
+    """
+    Shared HTTP transport for the RMS API.
+    Holds one pooled requests.Session so that every handler reuses keep-alive
+    connections instead of opening a new TCP/TLS connection per call.
+    Every request first takes a token from the endpoint's budget, and 429/5xx
+    responses are retried with Retry-After or jittered exponential backoff.
+    """
+
+    def __init__(
+            self,
+            auth_token: str,
+            timeout: Optional[float] = None,
+            pool_maxsize: Optional[int] = None,
+            session: Optional[requests.Session] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            max_retries: Optional[int] = None,
+            logger: Optional[Callable[[str], None]] = None,
+    ):
+        self.timeout = timeout if timeout is not None else env_settings.RMS_TIMEOUT
+        self.session = session or self._build_session(pool_maxsize or env_settings.RMS_POOL_MAXSIZE)
+        self.rate_limiter = rate_limiter or RateLimiter(
+            env_settings.RMS_RATE_LIMIT, env_settings.RMS_ENDPOINT_RATE_LIMITS
+        )
+        self.max_retries = max_retries if max_retries is not None else env_settings.RMS_MAX_RETRIES
+        # 重試訊息的輸出方式，預設寫入 logging（client 在多個 handler / 執行緒間共用，不直接 print）
+        self.logger = logger or _logger.warning
+
+        # 認證 header 只在建立時組一次，之後所有請求共用
+        self.session.headers.update({
+            "Authorization": f"Bearer {auth_token}",
+            "Content-Type": "application/json"
+        })
+
+    @staticmethod
+    def _build_session(pool_maxsize: int) -> requests.Session:
+        """
+        pool_connections: 快取幾個 host 的連線池
+        pool_maxsize: 每個 host 最多保留幾條 keep-alive 連線（需 >= 同時發出的請求數）
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(url)
+            resp = self.session.request(method, url, **kwargs)
+            if resp.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return resp
+
+            delay = backoff_delay(attempt, resp, env_settings.RMS_BACKOFF_BASE, env_settings.RMS_BACKOFF_MAX)
+            self.logger(f"RMS returned {resp.status_code} for {method} {url}, retrying in {delay:.1f}s "
+                  f"({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_default_clients: Dict[str, RMSClient] = {}
+_default_clients_lock = threading.Lock()
+
+
+def get_default_client(auth_token: str) -> RMSClient:
+    """
+    Returns the process-wide client for the given auth token, creating it on first use.
+    """
+    with _default_clients_lock:
+        client = _default_clients.get(auth_token)
+        if client is None:
+            client = RMSClient(auth_token)
+            _default_clients[auth_token] = client
+        return client
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from pydantic import BaseModel, Field, model_validator, ConfigDict
 
 
@@ -118,6 +118,64 @@ class PurchasablePeriod(BaseModel):
     end: str  # 販売終了日時
 
 
+# 以下解析函式只把 API dict 轉成各欄位的原始資料（巢狀 model 仍是 dict），
+# 驗證交給 ProductData 一次完成
+
+
+def _api_product_description(data: dict) -> dict:
+    # Handle nested product description from detailed view, fallback to flat view
+    if "productDescription" in data and isinstance(data["productDescription"], dict):
+        product_desc_data = data["productDescription"]
+        return {"pc": product_desc_data.get("pc", ""), "sp": product_desc_data.get("sp", "")}
+    # Fallback for search results or other flat structures
+    return {"pc": data.get("descriptionForPC", ""), "sp": data.get("descriptionForSmartPhone", "")}
+
+
+def _api_sales_description(data: dict) -> Optional[str]:
+    # Use salesDescription if present, else fallback to pc_desc
+    return data.get("salesDescription") or _api_product_description(data)["pc"]
+
+
+def _api_first_variant(data: dict) -> dict:
+    return next(iter(data.get("variants", {}).values()), {})
+
+
+def _api_reference_price(data: dict) -> Optional[dict]:
+    return _api_first_variant(data).get("referencePrice") or None
+
+
+def _api_customization_options(data: dict) -> List[dict]:
+    return [
+        {
+            "displayName": opt.get("displayName", ""),
+            "inputType": opt.get("inputType"),
+            "required": opt.get("required"),
+            "selections": opt.get("selections"),
+        }
+        for opt in data.get("customizationOptions", []) or []
+    ]
+
+
+# 欄位名稱 -> 由 API dict 解析該欄位的函式
+_API_FIELD_PARSERS: Dict[str, Callable[[dict], Any]] = {
+    "manage_number": lambda data: data.get("manageNumber", ""),
+    "item_number": lambda data: data.get("itemNumber"),
+    "title": lambda data: data.get("title"),
+    "tagline": lambda data: data.get("tagline"),
+    "product_description": _api_product_description,
+    "sales_description": _api_sales_description,
+    "api_sales_description": lambda data: data.get("salesDescription"),
+    "images": lambda data: data.get("images", []),
+    "genre_id": lambda data: data.get("genreId"),
+    "tags": lambda data: [str(tag) for tag in data.get("tags", [])],
+    "standard_price": lambda data: _api_first_variant(data).get("standardPrice"),
+    "reference_price_info": _api_reference_price,
+    "customization_options": _api_customization_options,
+    "point_campaign": lambda data: data.get("pointCampaign"),
+    "is_hidden": lambda data: data.get("hideItem", False),
+}
+
+
 class ProductData(BaseModel):
     manage_number: str  # 商品管理番号（商品URL）
     item_number: Optional[str] = None  # 商品番号
@@ -125,6 +183,8 @@ class ProductData(BaseModel):
     tagline: Optional[str] = None
     product_description: Optional[ProductDescription] = None  # 其他說明文
     sales_description: Optional[str] = None  # PC用販売説明文(pc_sub)
+    # RMS 上實際的 salesDescription；from_api 在沒有時會以 PC 說明文補進 sales_description，比對差異時用這個
+    api_sales_description: Optional[str] = Field(default=None, exclude=True)
     images: List[ProductImage] = Field(default_factory=list)
     genre_id: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
@@ -147,57 +207,7 @@ class ProductData(BaseModel):
         Creates a ProductData instance from a raw API dictionary.
         Handles both detailed (get_item) and summary (search_item) formats.
         """
-        # Handle nested product description from detailed view, fallback to flat view
-        if "productDescription" in data and isinstance(data["productDescription"], dict):
-            product_desc_data = data["productDescription"]
-            pc_desc = product_desc_data.get("pc", "")
-            sp_desc = product_desc_data.get("sp", "")
-        else:
-            # Fallback for search results or other flat structures
-            pc_desc = data.get("descriptionForPC", "")
-            sp_desc = data.get("descriptionForSmartPhone", "")
-
-        # Use salesDescription if present, else fallback to pc_desc
-        sales_desc = data.get("salesDescription") or pc_desc
-
-        tags = [str(tag) for tag in data.get("tags", [])]
-
-        first_variant = next(iter(data.get("variants", {}).values()), {})
-        standard_price = first_variant.get("standardPrice")
-        
-        reference_price_data = first_variant.get("referencePrice")
-        reference_price_info = ReferencePrice(**reference_price_data) if reference_price_data else None
-
-        co_raw = data.get("customizationOptions", []) or []
-        customization_options = []
-        for opt in co_raw:
-            sels = opt.get("selections")
-            sel_models = [CustomizationSelection(**s) for s in sels] if sels is not None else None
-            customization_options.append(
-                CustomizationOption(
-                    displayName=opt.get("displayName", ""),
-                    inputType=opt.get("inputType"),
-                    required=opt.get("required"),
-                    selections=sel_models,
-                )
-            )
-
-        return cls(
-            manage_number=data.get("manageNumber", ""),
-            item_number=data.get("itemNumber"),
-            title=data.get("title"),
-            tagline=data.get("tagline"),
-            product_description=ProductDescription(pc=pc_desc, sp=sp_desc),
-            sales_description=sales_desc,
-            images=[ProductImage(**img) for img in data.get("images", [])],
-            genre_id=data.get("genreId"),
-            tags=tags,
-            standard_price=standard_price,
-            reference_price_info=reference_price_info,
-            customization_options=customization_options,
-            point_campaign=PointCampaign(**data['pointCampaign']) if 'pointCampaign' in data else None,
-            is_hidden=data.get("hideItem", False)
-        )
+        return cls(**{name: parse(data) for name, parse in _API_FIELD_PARSERS.items()})
 
     def to_patch_payload(self) -> dict:
         """輸出給 patchItem，用來部分更新（略過 None 欄位）"""
@@ -242,3 +252,24 @@ class ProductData(BaseModel):
             "ポイント変倍率適用期間（終了日時）": self.point_campaign.applicable_period.end if self.point_campaign and self.point_campaign.applicable_period else "",
         }
         return csv_data
+
+
+class CampaignProductData(BaseModel):
+    """
+    CampaignUpdateFlow 會讀取的 ProductData 欄位子集。整份商品目錄只用來生成活動 Payload 時使用，
+    不會為 images、customizationOptions 等用不到的欄位建立 model，欄位值與 ProductData.from_api 相同。
+    """
+    manage_number: str
+    title: Optional[str] = None
+    product_description: Optional[ProductDescription] = None
+    sales_description: Optional[str] = None
+    api_sales_description: Optional[str] = Field(default=None, exclude=True)
+    point_campaign: Optional[PointCampaign] = Field(default=None, alias="pointCampaign")
+    is_hidden: bool = False
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def from_api(cls, data: dict) -> "CampaignProductData":
+        return cls(**{name: _API_FIELD_PARSERS[name](data) for name in cls.model_fields})
+
@@ -3,6 +3,7 @@ from copy import copy
 import streamlit as st
 
 from env_settings import EnvSettings
+from handlers.batch_executor import BatchWriteExecutor
 from handlers.excel_parser import ProductExcelParser
 from handlers.html_generator import HTMLGenerator
 from handlers.item_handler import ItemHandler
@@ -65,7 +66,7 @@ def show_htmls(store_id: str, product_datas: list):
     return p_html_dict
 
 
-def update_item_and_show_result(item_handler, manage_number, htmls):
+def build_patch_payload(manage_number, htmls):
     product_data = ProductData(
         manage_number=manage_number,
         product_description=ProductDescription(
@@ -74,10 +75,13 @@ def update_item_and_show_result(item_handler, manage_number, htmls):
         ),
         sales_description=htmls.get("pc_sub"),
     )
-    try:
-        item_handler.patch_item(manage_number, product_data.to_patch_payload())
-    except Exception as e:
-        st.error(f"商品 {manage_number} 更新失敗，錯誤訊息：{e}")
+    return product_data.to_patch_payload()
+
+
+def show_update_result(result):
+    manage_number = result.manage_number
+    if not result.success:
+        st.error(f"商品 {manage_number} 更新失敗，錯誤訊息：{result.error}")
     else:
         st.success(f"商品 {manage_number} 已成功更新！")
         if hasattr(env_settings, "TENPO_NAME"):
@@ -125,7 +129,7 @@ def show_page():
             # 使用 st.spinner 顯示載入中
             with st.spinner('正在轉換中...'):
                 # 實例化解析器並解析所有工作表
-                parser = ProductExcelParser(store_id, excel_bytes=uploaded_file.getvalue())
+                parser = ProductExcelParser(store_id, excel_bytes=uploaded_file.getvalue(), streaming=True)
                 product_datas = parser.parse_all_sheets()
 
                 if not product_datas:
@@ -165,11 +169,12 @@ def show_page():
         # --- 真正的更新邏輯區塊 ---
         if "items_to_update" in st.session_state and st.session_state.items_to_update:
             with st.spinner('正在更新所選商品...'):
-                for manage_number in st.session_state.items_to_update:
-                    update_item_and_show_result(
-                        item_handler, manage_number,
-                        st.session_state.p_html_dict[manage_number]
-                    )
+                executor = BatchWriteExecutor(item_handler.patch_item)
+                payloads = (
+                    (manage_number, build_patch_payload(manage_number, st.session_state.p_html_dict[manage_number]))
+                    for manage_number in st.session_state.items_to_update
+                )
+                executor.run(payloads, on_result=show_update_result)
 
             del st.session_state.items_to_update
             st.markdown("---")
@@ -3,14 +3,18 @@ from flows.ss_campaign_update_flow import SSCampaignUpdateFlow
 from flows.ss_campaign_revert_flow import SSCampaignRevertFlow
 from env_settings import EnvSettings
 from datetime import datetime, timedelta, timezone
+from utils.step_journal import StepJournal
 from utils.streamlit_utils import parse_manage_numbers_input
 
 JST = timezone(timedelta(hours=9))
 
 
-def run_flow(auth_token: str, manage_numbers: list[str], mode: str, campaign_start: str = None, campaign_end: str = None):
+def run_flow(auth_token: str, manage_numbers: list[str], mode: str, campaign_start: str = None, campaign_end: str = None,
+             resume: bool = True, dry_run: bool = False):
     """
     執行 SS Campaign 更新或還原流程，並將輸出顯示在 Streamlit 介面上。
+    resume 只適用於建立流程，為 True 時沿用上次中斷留下的步驟紀錄，否則清除紀錄重新執行。
+    dry_run 只適用於還原流程，只列出會變更的商品而不實際寫入。
     """
     log_area = st.empty()
     log_messages = []
@@ -26,12 +30,21 @@ def run_flow(auth_token: str, manage_numbers: list[str], mode: str, campaign_sta
         st.info(f"即將處理以下商品管理編號：{manage_numbers}")
 
         if mode == "Create Campaign Items":
-            flow = SSCampaignUpdateFlow(auth_token, campaign_start, campaign_end, logger=streamlit_logger)
+            start = datetime.fromisoformat(campaign_start)
+            journal = StepJournal.for_run(f"ss_create_{start:%Y%m%d%H%M}")
+            if not resume:
+                journal.reset()
+            flow = SSCampaignUpdateFlow(auth_token, campaign_start, campaign_end, logger=streamlit_logger,
+                                        journal=journal)
         else:  # Revert Campaign Items
+            # 還原步驟依商品目前的狀態決定，重新執行即會從中斷處繼續
             flow = SSCampaignRevertFlow(auth_token, logger=streamlit_logger)
 
         with st.spinner("正在執行流程..."):
-            flow.run(manage_numbers)
+            if mode == "Create Campaign Items":
+                flow.run(manage_numbers)
+            else:
+                flow.run(manage_numbers, dry_run=dry_run)
 
         st.success(f"SS Campaign {mode} 流程執行完畢！")
 
@@ -79,13 +92,21 @@ def main():
         campaign_end_dt = datetime.combine(campaign_end_date, campaign_end_time)
         campaign_end = campaign_end_dt.replace(tzinfo=JST).isoformat(timespec='seconds')
 
+    resume = True
+    dry_run = False
+    if mode == "Create Campaign Items":
+        resume = st.checkbox("從上次中斷處繼續（略過已完成的步驟）", value=True)
+    else:
+        dry_run = st.checkbox("僅預覽（Dry run，不實際刪除或更新商品）", value=False)
+
     if st.button("開始執行流程"):
         manage_numbers = parse_manage_numbers_input(manage_numbers_input)
         if not manage_numbers:
             st.warning("請輸入有效的商品管理編號。")
             return
 
-        run_flow(auth_token, manage_numbers, mode, campaign_start=campaign_start, campaign_end=campaign_end)
+        run_flow(auth_token, manage_numbers, mode, campaign_start=campaign_start, campaign_end=campaign_end,
+                 resume=resume, dry_run=dry_run)
 
 
 if __name__ == "__main__":
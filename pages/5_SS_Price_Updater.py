@@ -1,10 +1,25 @@
 import streamlit as st
 from flows.ss_price_update_flow import PriceUpdater, PriceReversion
 from env_settings import EnvSettings
-from utils.streamlit_utils import parse_manage_numbers_input
+from handlers.price_rules import PriceRuleSet
+from utils.streamlit_utils import parse_discount_overrides, parse_manage_numbers_input
 
 
-def run_flow(auth_token: str, manage_numbers: list[str], mode: str, discount: float = None):
+def preview_prices(auth_token: str, manage_numbers: list[str], rules: PriceRuleSet):
+    """
+    Shows the price preview table for the given rule set without updating any item.
+    """
+    try:
+        with st.spinner("正在讀取商品並計算新價格..."):
+            preview = PriceUpdater(auth_token, rules=rules, logger=st.warning).preview(manage_numbers)
+        skipped = int(preview["skip_reason"].notna().sum())
+        st.info(f"共 {len(preview)} 個 SKU，其中 {skipped} 個無法計算新價格將被略過。")
+        st.dataframe(preview, use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"發生未預期的錯誤：{e}")
+
+
+def run_flow(auth_token: str, manage_numbers: list[str], mode: str, rules: PriceRuleSet = None):
     """
     Runs the selected price update flow and displays the output in the Streamlit interface.
     """
@@ -22,7 +37,7 @@ def run_flow(auth_token: str, manage_numbers: list[str], mode: str, discount: fl
         st.info(f"正在處理以下商品管理編號：{manage_numbers}")
 
         if mode == "Update Prices":
-            flow = PriceUpdater(auth_token, discount, logger=streamlit_logger)
+            flow = PriceUpdater(auth_token, rules=rules, logger=streamlit_logger)
         else:
             flow = PriceReversion(auth_token, logger=streamlit_logger)
 
@@ -59,7 +74,7 @@ def main():
         placeholder="例如：item1, item2, item3 或\nitem1\nitem2"
     )
 
-    discount_input = None
+    rules = None
     if mode == "Update Prices":
         discount_input = st.number_input(
             "請輸入折扣乘數 (例如，0.8 代表八折)：",
@@ -69,13 +84,53 @@ def main():
             step=0.05
         )
 
+        with st.expander("進階價格規則"):
+            overrides_input = st.text_area(
+                "個別折扣（每行一筆，優先於上方折扣）：",
+                placeholder="商品管理編號,折扣 例如：item1,0.7\n商品管理編號,SKU,折扣 例如：item2,sku-a,0.5"
+            )
+            col1, col2 = st.columns(2)
+            round_to = col1.selectbox("價格取整單位（日圓）", (1, 10, 100), index=0)
+            rounding = col2.selectbox("取整方式", ("floor", "ceil", "nearest"), index=0,
+                                      format_func={"floor": "無條件捨去", "ceil": "無條件進位",
+                                                   "nearest": "四捨五入"}.get)
+            min_price = col1.number_input("最低價格（0 表示不限制）", min_value=0, value=0, step=100)
+            max_price = col2.number_input("最高價格（0 表示不限制）", min_value=0, value=0, step=100)
+            min_price_ratio = st.number_input(
+                "新價格不得低於原價的比例（0 表示不限制，例如 0.5 代表最多打五折）",
+                min_value=0.0, max_value=1.0, value=0.0, step=0.05
+            )
+
+        try:
+            item_discounts, sku_discounts = parse_discount_overrides(overrides_input)
+            rules = PriceRuleSet(
+                discount=discount_input,
+                item_discounts=item_discounts,
+                sku_discounts=sku_discounts,
+                round_to=round_to,
+                rounding=rounding,
+                min_price=min_price or None,
+                max_price=max_price or None,
+                min_price_ratio=min_price_ratio or None,
+            )
+        except ValueError as e:
+            st.error(f"價格規則設定有誤：{e}")
+            return
+
+    manage_numbers = parse_manage_numbers_input(manage_numbers_input)
+
+    if mode == "Update Prices" and st.button("預覽新價格"):
+        if not manage_numbers:
+            st.warning("請輸入有效的商品管理編號。")
+            return
+        preview_prices(auth_token, manage_numbers, rules)
+
     if st.button("開始執行商品價格更新流程"):
-        manage_numbers = parse_manage_numbers_input(manage_numbers_input)
         if not manage_numbers:
             st.warning("請輸入有效的商品管理編號。")
             return
 
-        run_flow(auth_token, manage_numbers, mode, discount=discount_input)
+        run_flow(auth_token, manage_numbers, mode, rules=rules)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import os
 from datetime import date
 
 import streamlit as st
@@ -6,8 +7,11 @@ import json
 from urllib3.exceptions import MaxRetryError
 
 from flows.campaign_update_flow import CampaignUpdateFlow, CampaignConfig
+from handlers.batch_executor import BatchWriteExecutor
 from handlers.item_handler import ItemHandler
-from models.item import ProductData
+from handlers.item_store import ItemStore
+from handlers.payload_store import JsonlPayloadStore
+from models.item import CampaignProductData
 from env_settings import EnvSettings
 
 env_settings = EnvSettings()
@@ -57,8 +61,9 @@ def init_session_state():
         st.session_state[SessionStateKeys.FEATURE_IDS_PREFIX.format(1)] = ""
     if SessionStateKeys.NUM_FEATURE_CAMPAIGNS not in st.session_state:
         st.session_state[SessionStateKeys.NUM_FEATURE_CAMPAIGNS] = 1
-    if "final_payloads" not in st.session_state:
-        st.session_state["final_payloads"] = []
+    if "payload_store" not in st.session_state:
+        # 生成結果寫入暫存 JSONL 檔，分頁顯示與更新時逐筆讀取，不在 session 中保留整份 payload
+        st.session_state["payload_store"] = JsonlPayloadStore()
 
 
 def render_config_uploader():
@@ -110,41 +115,61 @@ def render_config_uploader():
                 st.error(f"載入設定檔時發生錯誤: {e}")
 
 
-def generate_payloads(campaign_config, point_campaigns, feature_campaigns, target_item_ids: list[str] | None = None):
-    # --- Get All Products ---
-    with st.spinner("正在從後台取得所有商品資料..."):
+def generate_payloads(campaign_config, point_campaigns, feature_campaigns, target_item_ids: list[str] | None = None,
+                      use_item_cache: bool = False, use_processes: bool = False):
+    # --- Get All Products & Generate Payloads ---
+    # 商品資料以 iterator 逐頁取得，flow 邊讀邊建立快取，不會同時保留原始 dict 與 ProductData 兩份
+    with st.spinner("正在從後台取得商品資料並生成Payload..."):
         try:
             item_handler = ItemHandler(env_settings.auth_token)
+            fetch_failures = {}
             if target_item_ids:
-                all_items_raw = item_handler.bulk_get_item(target_item_ids)
-                all_products = [ProductData.from_api(item) for item in all_items_raw]
-                st.info(f"共取得 {len(all_products)} 筆指定商品")
+                all_items_raw, fetch_failures = item_handler.bulk_get_item_with_failures(target_item_ids)
+                all_products = (CampaignProductData.from_api(item) for item in all_items_raw)
+            elif use_item_cache:
+                # 只同步上次之後有更新的商品，其餘直接從本地快取讀取
+                item_store = ItemStore(logger=st.warning)
+                synced_count = item_store.sync(item_handler, default_since=f"{date.today().year}-01-01")
+                st.info(f"已同步 {synced_count} 筆更新商品至本地快取")
+                all_products = item_store.iter_products(product_model=CampaignProductData)
             else:
-                all_items_raw = item_handler.search_item({"updatedFrom": f"{date.today().year}-01-01"}, page_size=100,
-                                                         max_page=20)
-                all_products = [ProductData.from_api(item.get("item")) for item in all_items_raw]
-                st.info(f"共取得 {len(all_products)} 筆商品")
+                all_products = item_handler.iter_search_products(
+                    {"updatedFrom": f"{date.today().year}-01-01"}, page_size=100, max_page=20,
+                    product_model=CampaignProductData,
+                )
+
+            payload_store = st.session_state["payload_store"]
+            flow = CampaignUpdateFlow()
+            flow.execute(
+                all_products=all_products,
+                config=campaign_config,
+                point_campaigns=point_campaigns,
+                feature_campaigns=feature_campaigns,
+                skip_unchanged=True,
+                # 大型商品目錄可選擇分散到多個行程產生 payload；分類未超過 SHARD_SIZE 時仍在本行程產生
+                processes=os.cpu_count() if use_processes else None,
+                sink=payload_store,
+            )
         except MaxRetryError:
             st.error("連線超時，請再試一次")
             return
 
-    with st.spinner("正在生成Payload..."):
-        flow = CampaignUpdateFlow()
-        final_payloads = flow.execute(
-            all_products=all_products,
-            config=campaign_config,
-            point_campaigns=point_campaigns,
-            feature_campaigns=feature_campaigns,
-        )
-    st.session_state["final_payloads"] = final_payloads
+    if target_item_ids:
+        st.info(f"共取得 {len(flow.original_items_cache)} 筆指定商品")
+        if fetch_failures:
+            st.warning(f"{len(fetch_failures)} 筆指定商品取得失敗：{', '.join(fetch_failures)}")
+    else:
+        st.info(f"共取得 {len(flow.original_items_cache)} 筆商品")
+    if flow.unchanged_item_ids:
+        st.info(f"{len(flow.unchanged_item_ids)} 筆商品內容已是最新，略過更新")
 
 
 def render_results():
-    if "final_payloads" in st.session_state and st.session_state["final_payloads"]:
+    payload_store = st.session_state.get("payload_store")
+    if payload_store:
         st.write("---")
         st.subheader("生成結果")
-        payload_items = list(st.session_state["final_payloads"].items())
-        total_items = len(payload_items)
+        total_items = len(payload_store)
         items_per_page = 20
         total_pages = (total_items + items_per_page - 1) // items_per_page
 
@@ -169,44 +194,41 @@ def render_results():
             end_index = min(start_index + items_per_page, total_items)
             st.text(f"總筆數: {total_items} / 總頁數: {total_pages} / 目前顯示第 {start_index + 1}-{end_index} 筆")
 
-            paginated_payloads = dict(payload_items[start_index:end_index])
+            paginated_payloads = payload_store.read_page(start_index, items_per_page)
 
             st.json(json.dumps(paginated_payloads, indent=4, ensure_ascii=False), expanded=False)
 
 
 def execute_item_update():
-    if not st.session_state["final_payloads"]:
+    payload_store = st.session_state["payload_store"]
+    if not payload_store:
         st.warning("沒有可更新的商品資訊。請先點擊 '生成' 按鈕。")
         return
 
     item_handler = ItemHandler(env_settings.auth_token)
-    updated_count = 0
-    failed_updates = []
+    executor = BatchWriteExecutor(item_handler.patch_item)
 
-    total_items = len(st.session_state["final_payloads"])
+    total_items = len(payload_store)
     progress_bar = st.progress(0)
     status_text = st.empty()
+    finished_count = 0
 
-    for i, (item_id, item_data) in enumerate(st.session_state["final_payloads"].items()):
-        try:
-            # Create a ProductData object with only the manage_number and the generated payload
-            # The to_patch_payload method will handle filtering None values
-            status_text.text(f"正在更新商品: {item_id} ({i + 1}/{total_items})")
-            item_handler.patch_item(item_id, item_data)
-            updated_count += 1
-        except Exception as e:
-            failed_updates.append(f"商品 {item_id} 更新失敗: {e}")
+    def show_progress(result):
+        nonlocal finished_count
+        finished_count += 1
+        status_text.text(f"已處理商品: {result.manage_number} ({finished_count}/{total_items})")
+        progress_bar.progress(finished_count / total_items)
 
-        progress_bar.progress((i + 1) / total_items)
+    report = executor.run(payload_store.iter_items(), on_result=show_progress)
 
     status_text.text("更新完成！")
 
-    if updated_count > 0:
-        st.success(f"成功更新 {updated_count} 項商品！")
-    if failed_updates:
+    if report.successful:
+        st.success(f"成功更新 {len(report.successful)} 項商品！")
+    if report.failed:
         st.error("部分商品更新失敗:")
-        for error_msg in failed_updates:
-            st.write(error_msg)
+        for item_id, error in report.failed.items():
+            st.write(f"商品 {item_id} 更新失敗: {error}")
 
 
 def show_page():
@@ -355,12 +377,22 @@ def show_page():
     st.write("---")
     st.subheader("指定商品")
     target_item_ids_str = st.text_area("指定商品 manage_number (一行一個)，如果為空則處理所有商品")
+    # RMS 上刪除的商品不會從快取移除，預設不使用
+    use_item_cache = st.checkbox("使用本地商品快取（只同步上次之後有更新的商品，已刪除的商品仍會保留）", value=False)
+    if use_item_cache and st.button("清除本地商品快取"):
+        ItemStore().clear()
+        st.success("已清除本地商品快取，下次生成時會重新下載所有商品")
+
+    use_processes = st.checkbox(
+        f"使用多個行程產生 payload（適用於單一分類超過 {CampaignUpdateFlow.SHARD_SIZE} 筆的大型商品目錄）", value=False
+    )
 
     if st.button("生成"):
-        st.session_state["final_payloads"] = []  # Clear previous results
+        st.session_state["payload_store"].clear()  # Clear previous results
         st.session_state["page_number"] = 1  # Reset page number
         target_item_ids = list(set(line.strip() for line in target_item_ids_str.split('\n') if line.strip()))
-        generate_payloads(campaign_config, point_campaigns, feature_campaigns, target_item_ids)
+        generate_payloads(campaign_config, point_campaigns, feature_campaigns, target_item_ids, use_item_cache,
+                          use_processes)
 
     # --- Display Results ---
     render_results()
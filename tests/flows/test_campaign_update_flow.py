@@ -2,7 +2,8 @@ import json
 from pathlib import Path
 import pytest
 from flows.campaign_update_flow import CampaignUpdateFlow, CampaignConfig
-from models.item import ProductData, ProductDescription
+from handlers.payload_store import JsonlPayloadStore
+from models.item import CampaignProductData, ProductData, ProductDescription, PointCampaign
 
 
 def load_test_case():
@@ -38,3 +39,108 @@ def test_campaign_update_flow(campaign_data):
 
     # 3. Assert
     assert actual_output == expected_output
+
+
+def test_campaign_update_flow_accepts_campaign_product_data(campaign_data):
+    input_data = campaign_data["input"]
+    fields = set(CampaignProductData.model_fields)
+    all_products = [CampaignProductData(**ProductData(**p).model_dump(include=fields)) for p in input_data["all_products"]]
+
+    actual_output = CampaignUpdateFlow().execute(
+        all_products=all_products,
+        config=CampaignConfig(**input_data["config"]),
+        point_campaigns=input_data["point_campaigns"],
+        feature_campaigns=input_data["feature_campaigns"],
+    )
+
+    assert actual_output == campaign_data["out_put"]
+
+
+def test_campaign_update_flow_skips_unchanged_fields(campaign_data):
+    # 1. Arrange: products already carry the generated campaign content
+    input_data = campaign_data["input"]
+    expected_output = campaign_data["out_put"]
+
+    all_products = []
+    for p in input_data["all_products"]:
+        product = ProductData(**p)
+        payload = expected_output.get(product.manage_number, {})
+        if "title" in payload:
+            product.title = payload["title"]
+        if "productDescription" in payload:
+            product.product_description = ProductDescription(**payload["productDescription"])
+        if "salesDescription" in payload:
+            product.sales_description = payload["salesDescription"]
+        if "pointCampaign" in payload:
+            product.point_campaign = PointCampaign(**payload["pointCampaign"])
+        all_products.append(product)
+
+    # The 10-point item still shows an old point rate
+    ten_point_item = next(p for p in all_products if p.manage_number == "10_point_item")
+    ten_point_item.point_campaign = None
+
+    flow = CampaignUpdateFlow()
+
+    # 2. Act
+    actual_output = flow.execute(
+        all_products=all_products,
+        config=CampaignConfig(**input_data["config"]),
+        point_campaigns=input_data["point_campaigns"],
+        feature_campaigns=input_data["feature_campaigns"],
+        skip_unchanged=True,
+    )
+
+    # 3. Assert
+    assert actual_output == {"10_point_item": {"pointCampaign": expected_output["10_point_item"]["pointCampaign"]}}
+    assert flow.unchanged_item_ids == set(expected_output) - {"10_point_item"}
+
+
+def test_campaign_update_flow_multiprocess_matches_single_process(campaign_data, monkeypatch):
+    input_data = campaign_data["input"]
+    # 每個 shard 只放一個商品，確保每個分類都會經過 process pool
+    monkeypatch.setattr(CampaignUpdateFlow, "SHARD_SIZE", 1)
+
+    actual_output = CampaignUpdateFlow().execute(
+        all_products=[ProductData(**p) for p in input_data["all_products"]],
+        config=CampaignConfig(**input_data["config"]),
+        point_campaigns=input_data["point_campaigns"],
+        feature_campaigns=input_data["feature_campaigns"],
+        processes=2,
+    )
+
+    assert actual_output == campaign_data["out_put"]
+    assert list(actual_output) == list(CampaignUpdateFlow().execute(
+        all_products=[ProductData(**p) for p in input_data["all_products"]],
+        config=CampaignConfig(**input_data["config"]),
+        point_campaigns=input_data["point_campaigns"],
+        feature_campaigns=input_data["feature_campaigns"],
+    ))
+
+
+def test_campaign_update_flow_writes_to_sink(campaign_data, tmp_path):
+    input_data = campaign_data["input"]
+    sink = JsonlPayloadStore(tmp_path / "payloads.jsonl")
+
+    actual_output = CampaignUpdateFlow().execute(
+        all_products=[ProductData(**p) for p in input_data["all_products"]],
+        config=CampaignConfig(**input_data["config"]),
+        point_campaigns=input_data["point_campaigns"],
+        feature_campaigns=input_data["feature_campaigns"],
+        sink=sink,
+    )
+
+    assert actual_output == {}
+    assert dict(sink.iter_items()) == campaign_data["out_put"]
+
+
+def test_diff_payload_compares_raw_sales_description():
+    # RMS 上沒有 salesDescription，from_api 以 PC 說明文補上 sales_description
+    product = ProductData.from_api({"manageNumber": "a", "productDescription": {"pc": "<p>pc</p>", "sp": ""}})
+    assert product.sales_description == "<p>pc</p>"
+
+    diff = CampaignUpdateFlow._diff_payload({"salesDescription": "<p>pc</p>"}, product)
+
+    assert diff == {"salesDescription": "<p>pc</p>"}
+    assert CampaignUpdateFlow._diff_payload(
+        {"salesDescription": "<p>pc</p>"}, ProductData(manage_number="a", sales_description="<p>pc</p>")
+    ) == {}
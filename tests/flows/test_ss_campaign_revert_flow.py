@@ -0,0 +1,104 @@
+import threading
+
+import requests
+
+from flows.ss_campaign_revert_flow import SSCampaignRevertFlow
+
+
+def make_http_error(status_code: int, text: str) -> requests.exceptions.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = text.encode("utf-8")
+    return requests.exceptions.HTTPError(response=resp)
+
+
+class FakeItemHandler:
+    """In-memory catalog; records every write made by the flow."""
+
+    def __init__(self, items):
+        self.items = {item["manageNumber"]: item for item in items}
+        self.writes = []
+        self.bulk_reads = 0
+        self._lock = threading.Lock()
+
+    def bulk_get_item_with_failures(self, manage_numbers, chunk_size=50, max_workers=4):
+        self.bulk_reads += 1
+        return [self.items[number] for number in manage_numbers if number in self.items], {}
+
+    def delete_item(self, manage_number):
+        with self._lock:
+            self.writes.append(("delete_item", manage_number))
+            if self.items.pop(manage_number, None) is None:
+                raise make_http_error(404, "not found")
+
+    def patch_item(self, manage_number, payload):
+        with self._lock:
+            self.writes.append(("patch_item", manage_number))
+            self.items[manage_number].update(payload)
+
+
+def make_catalog():
+    return FakeItemHandler([
+        # 尚未還原
+        {"manageNumber": "item-1", "hideItem": True, "purchasablePeriod": {"start": "a", "end": "b"}},
+        {"manageNumber": "item-1_sscp", "hideItem": False},
+        # 已刪除 _sscp，但原始商品仍隱藏
+        {"manageNumber": "item-2", "hideItem": True, "purchasablePeriod": {"start": "a", "end": "b"}},
+        # 已還原完成
+        {"manageNumber": "item-3", "hideItem": False},
+    ])
+
+
+def make_flow(handler, logs):
+    flow = SSCampaignRevertFlow("token", logger=logs.append, max_workers=4)
+    flow.item_handler = handler
+    return flow
+
+
+def test_ss_campaign_revert_flow_dry_run_reports_without_writing():
+    handler = make_catalog()
+    logs = []
+
+    make_flow(handler, logs).run(["item-1", "item-2", "item-3"], dry_run=True)
+
+    assert handler.writes == []
+    assert handler.bulk_reads == 1
+    assert "  - item-1: would Delete campaign item (_sscp), Unhide original item." in logs
+    assert "  - item-2: would Unhide original item." in logs
+    assert "  - item-3: already reverted, nothing to do." in logs
+
+
+def test_ss_campaign_revert_flow_skips_completed_items_and_is_idempotent():
+    handler = make_catalog()
+    logs = []
+    flow = make_flow(handler, logs)
+
+    flow.run(["item-1", "item-2", "item-3"])
+
+    assert sorted(handler.writes) == [
+        ("delete_item", "item-1_sscp"), ("patch_item", "item-1"), ("patch_item", "item-2"),
+    ]
+    # 刪除 _sscp 之後才重新顯示原始商品
+    assert handler.writes.index(("delete_item", "item-1_sscp")) < handler.writes.index(("patch_item", "item-1"))
+    assert "Successful: 3" in logs
+
+    # 再執行一次不會送出任何寫入
+    handler.writes.clear()
+    flow.run(["item-1", "item-2", "item-3"])
+    assert handler.writes == []
+
+
+def test_ss_campaign_revert_flow_treats_missing_campaign_item_as_deleted():
+    handler = make_catalog()
+    logs = []
+    flow = make_flow(handler, logs)
+    # bulk-get 之後 _sscp 商品被其他人刪除
+    flow.plan_revert = lambda numbers: {"item-1": ["delete_campaign_item", "revert_original"]}
+    del handler.items["item-1_sscp"]
+
+    flow.run(["item-1"])
+
+    assert handler.writes == [("delete_item", "item-1_sscp"), ("patch_item", "item-1")]
+    assert "  - item-1: Campaign item not found, skipping deletion." in logs
+    assert "Successful: 1" in logs
+
@@ -0,0 +1,188 @@
+import threading
+
+import pytest
+import requests
+
+from flows.ss_campaign_update_flow import SSCampaignUpdateFlow
+from utils.step_journal import StepJournal
+
+
+def make_http_error(status_code: int, text: str) -> requests.exceptions.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = text.encode("utf-8")
+    return requests.exceptions.HTTPError(response=resp)
+
+
+class FakeRMS:
+    """Records every RMS call made by the flow, in call order."""
+
+    def __init__(self, failing_creates=()):
+        self.calls = []
+        self.failing_creates = set(failing_creates)
+        self.inventories = {}
+        self.item_overrides = {}
+        self.created_items = {}
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+
+    # ItemHandler
+    def get_item(self, manage_number):
+        self._record("get_item", manage_number)
+        item = {"manageNumber": manage_number, "title": manage_number, "created": "x", "updated": "y"}
+        item.update(self.item_overrides.get(manage_number, {}))
+        return item
+
+    def upsert_item(self, manage_number, item):
+        self._record("upsert_item", manage_number)
+        if manage_number in self.failing_creates:
+            raise make_http_error(400, "bad item")
+        self.created_items[manage_number] = item
+
+    def patch_item(self, manage_number, payload):
+        self._record("patch_item", manage_number)
+
+    # CategoryHandler
+    def get_category_mapping(self, manage_number):
+        self._record("get_category_mapping", manage_number)
+        return {"categoryIds": [f"cat-{manage_number}"]}
+
+    def update_category_mapping(self, manage_number, category_ids, main_plural_category_id=None):
+        self._record("update_category_mapping", manage_number)
+
+    # InventoryHandler
+    def get_variant_list(self, manage_number):
+        self._record("get_variant_list", manage_number)
+        return {"variantList": [f"{manage_number}-v1", f"{manage_number}-v2"]}
+
+    def bulk_get_inventory(self, inventories):
+        self._record("bulk_get_inventory", len(inventories))
+        return {"inventories": [dict(inv, quantity=5) for inv in inventories]}
+
+    def bulk_upsert(self, inventories):
+        self._record("bulk_upsert", len(inventories))
+        with self._lock:
+            for inv in inventories:
+                self.inventories[(inv["manageNumber"], inv["variantId"])] = inv["quantity"]
+
+
+@pytest.fixture
+def fake_rms():
+    return FakeRMS(failing_creates={"item-2_sscp"})
+
+
+def make_flow(fake_rms, logs):
+    flow = SSCampaignUpdateFlow(
+        "token", "2025-12-04T20:00:00+09:00", "2025-12-11T01:59:00+09:00", logger=logs.append, max_workers=4
+    )
+    flow.item_handler = flow.category_handler = flow.inventory_handler = fake_rms
+    return flow
+
+
+def test_ss_campaign_update_flow_runs_steps_in_dependency_order(fake_rms):
+    logs = []
+    flow = make_flow(fake_rms, logs)
+    manage_numbers = [f"item-{i}" for i in range(5)]
+
+    flow.run(manage_numbers)
+
+    calls = fake_rms.calls
+    for manage_number in manage_numbers:
+        new_manage_number = f"{manage_number}_sscp"
+        if manage_number == "item-2":
+            # 建立失敗的商品不會動到原始商品
+            assert ("patch_item", manage_number) not in calls
+            assert ("update_category_mapping", new_manage_number) not in calls
+            continue
+
+        assert calls.index(("get_item", manage_number)) < calls.index(("upsert_item", new_manage_number))
+        assert calls.index(("upsert_item", new_manage_number)) < calls.index(
+            ("update_category_mapping", new_manage_number))
+        assert calls.index(("update_category_mapping", new_manage_number)) < calls.index(
+            ("patch_item", manage_number))
+        assert calls.index(("bulk_upsert", 8)) < calls.index(("patch_item", manage_number))
+        assert fake_rms.inventories[(new_manage_number, f"{manage_number}-v1")] == 5
+
+    # 5 個商品共 10 個 SKU：庫存只讀一次、寫一次
+    assert [c for c in calls if c[0] in ("bulk_get_inventory", "bulk_upsert")] == [
+        ("bulk_get_inventory", 8), ("bulk_upsert", 8)
+    ]
+    assert "Successful: 4" in logs
+    assert "Failed: 1" in logs
+    assert any("item-2" in log and "400 bad item" in log for log in logs)
+
+
+def test_ss_campaign_update_flow_batches_inventory_requests(fake_rms, monkeypatch):
+    monkeypatch.setattr("handlers.inventory_handler.InventoryHandler.BULK_GET_LIMIT", 3)
+    monkeypatch.setattr("handlers.inventory_handler.InventoryHandler.BULK_UPSERT_LIMIT", 2)
+    flow = make_flow(fake_rms, [])
+
+    flow.run(["item-0", "item-1", "item-3", "item-4"])
+
+    inventory_calls = [c for c in fake_rms.calls if c[0] in ("bulk_get_inventory", "bulk_upsert")]
+    assert inventory_calls == [
+        ("bulk_get_inventory", 3), ("bulk_get_inventory", 3), ("bulk_get_inventory", 2),
+        ("bulk_upsert", 2), ("bulk_upsert", 2), ("bulk_upsert", 2), ("bulk_upsert", 2),
+    ]
+    assert len(fake_rms.inventories) == 8
+
+
+def test_ss_campaign_update_flow_resumes_from_journal(fake_rms, tmp_path):
+    journal = StepJournal(tmp_path / "ss_create.jsonl")
+    manage_numbers = ["item-1", "item-2"]
+
+    # 1st run: item-2 fails while creating its campaign item
+    flow = make_flow(fake_rms, [])
+    flow.journal = journal
+    flow.run(manage_numbers)
+    assert journal.is_done("item-1", "update_original")
+    # 讀取步驟不寫入 journal
+    assert not journal.is_done("item-2", "get_item")
+    assert not journal.is_done("item-2", "create_item")
+
+    # 2nd run: the user fixed item-2 in RMS; only item-2's unfinished steps are executed,
+    # and its data is fetched again instead of reusing the first run's result
+    fake_rms.failing_creates.clear()
+    fake_rms.item_overrides["item-2"] = {"title": "fixed title"}
+    fake_rms.calls.clear()
+    logs = []
+    flow = make_flow(fake_rms, logs)
+    flow.journal = StepJournal(tmp_path / "ss_create.jsonl")
+    flow.run(manage_numbers)
+
+    assert sorted(fake_rms.calls) == sorted([
+        ("get_item", "item-2"),
+        ("get_category_mapping", "item-2"),
+        ("get_variant_list", "item-2"),
+        ("upsert_item", "item-2_sscp"),
+        ("update_category_mapping", "item-2_sscp"),
+        ("bulk_get_inventory", 2),
+        ("bulk_upsert", 2),
+        ("patch_item", "item-2"),
+    ])
+    assert fake_rms.created_items["item-2_sscp"]["title"] == "fixed title"
+    assert "Successful: 2" in logs
+    # 全部成功後清除紀錄
+    assert not (tmp_path / "ss_create.jsonl").exists()
+
+
+def test_ss_campaign_update_flow_ignores_journaled_read_steps(fake_rms, tmp_path):
+    # 舊版 journal 記錄了讀取步驟的結果：續跑時仍重新讀取，只略過已完成的寫入步驟
+    journal = StepJournal(tmp_path / "ss_create.jsonl")
+    journal.record("item-1", "get_item", {"manageNumber": "item-1", "title": "stale"})
+    journal.record("item-1", "get_category", {"categoryIds": ["stale"]})
+    journal.record("item-1", "get_variants", ["item-1-v1", "item-1-v2"])
+    journal.record("item-1", "inventory")
+    flow = make_flow(fake_rms, [])
+    flow.journal = journal
+
+    flow.run(["item-1"])
+
+    assert fake_rms.created_items["item-1_sscp"]["title"] == "item-1"
+    assert ("get_category_mapping", "item-1") in fake_rms.calls
+    # 庫存已複製過，SKU 清單不需要再讀取
+    assert ("get_variant_list", "item-1") not in fake_rms.calls
+    assert not any(call[0] == "bulk_upsert" for call in fake_rms.calls)
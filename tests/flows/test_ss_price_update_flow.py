@@ -0,0 +1,111 @@
+import threading
+
+import requests
+
+from flows.ss_price_update_flow import PriceReversion, PriceUpdater
+from handlers.item_handler import ItemHandler
+from handlers.price_snapshot_store import PriceSnapshotStore
+
+
+class FakePriceClient:
+    """Serves items/bulk-get and PATCH; records the order in which reads and writes happen."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.events = []
+        self.patched = {}
+        self.variants = {}
+        self._lock = threading.Lock()
+
+    def _response(self, status_code, body):
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp._content = requests.compat.json.dumps(body).encode("utf-8")
+        return resp
+
+    def post(self, url, data=None):
+        manage_numbers = requests.compat.json.loads(data)["manageNumbers"]
+        with self._lock:
+            self.events.append(("bulk_get", manage_numbers[0]))
+        if self.failing.intersection(manage_numbers):
+            return self._response(500, "server error")
+        results = [{"manageNumber": m, "variants": self.variants.get(m, {"v1": {"standardPrice": "1000"}})}
+                   for m in manage_numbers]
+        return self._response(200, {"results": results})
+
+    def patch(self, url, data=None):
+        manage_number = url.rsplit("/", 1)[-1]
+        with self._lock:
+            self.events.append(("patch", manage_number))
+            self.patched[manage_number] = requests.compat.json.loads(data)
+        return self._response(204, {})
+
+
+def make_flow(client, logs, tmp_path, flow_class=PriceUpdater, **kwargs):
+    snapshot_store = PriceSnapshotStore(tmp_path / "price_snapshots.sqlite3")
+    flow = flow_class("token", logger=logs.append, snapshot_store=snapshot_store, chunk_size=50, max_workers=2,
+                      **kwargs)
+    flow.item_handler = ItemHandler("token", client=client)
+    return flow
+
+
+def test_price_updater_patches_while_later_chunks_are_fetched(tmp_path):
+    client = FakePriceClient()
+    manage_numbers = [f"item-{i}" for i in range(300)]
+
+    make_flow(client, [], tmp_path, discount=0.8).run(manage_numbers)
+
+    assert sorted(client.patched) == sorted(manage_numbers)
+    assert client.patched["item-0"]["variants"]["v1"]["standardPrice"] == "800"
+    # 第一筆 patch 在最後一組下載之前就送出
+    first_patch = next(i for i, event in enumerate(client.events) if event[0] == "patch")
+    assert first_patch < client.events.index(("bulk_get", "item-250"))
+
+
+def test_price_updater_reports_failed_chunks(tmp_path):
+    client = FakePriceClient(failing={"item-60"})
+    logs = []
+
+    make_flow(client, logs, tmp_path, discount=0.8).run([f"item-{i}" for i in range(120)])
+
+    assert len(client.patched) == 70
+    assert "Successful: 70" in logs
+    assert "Failed: 50" in logs
+
+
+def test_price_reversion_restores_snapshot_without_reading(tmp_path):
+    client = FakePriceClient()
+    client.variants["item-1"] = {
+        "v1": {"standardPrice": "900", "referencePrice": {"displayType": "REFERENCE_PRICE", "type": 1, "value": "1999"}},
+        "v2": {"standardPrice": "500"},
+    }
+    make_flow(client, [], tmp_path, discount=0.5).run(["item-1"])
+    assert client.patched["item-1"]["variants"]["v1"]["standardPrice"] == "999"
+
+    client.events.clear()
+    logs = []
+    make_flow(client, logs, tmp_path, flow_class=PriceReversion).run(["item-1", "item-2"])
+
+    # 有快照的 item-1 不需要讀取，只有 item-2 走 bulk-get
+    assert client.events.count(("bulk_get", "item-1")) == 0
+    assert ("bulk_get", "item-2") in client.events
+    assert client.patched["item-1"] == {"variants": {
+        "v1": {"standardPrice": "900",
+               "referencePrice": {"displayType": "REFERENCE_PRICE", "type": 1, "value": "1999"}},
+        "v2": {"standardPrice": "500", "referencePrice": None},
+    }}
+    assert "Successful: 1" in logs    # item-2 沒有 referencePrice，不需更新
+    assert len(PriceSnapshotStore(tmp_path / "price_snapshots.sqlite3")) == 0
+
+
+def test_price_updater_replaces_stale_snapshot_of_item_at_original_price(tmp_path):
+    client = FakePriceClient()
+    client.variants["item-1"] = {"v1": {"standardPrice": "1000"}}
+    make_flow(client, [], tmp_path, discount=0.5).run(["item-1"])
+
+    # 上次活動沒有還原快照（例如還原被略過），之後商品被手動改回原價並調整為 1200
+    client.variants["item-1"] = {"v1": {"standardPrice": "1200"}}
+    make_flow(client, [], tmp_path, discount=0.5).run(["item-1"])
+
+    make_flow(client, [], tmp_path, flow_class=PriceReversion).run(["item-1"])
+    assert client.patched["item-1"] == {"variants": {"v1": {"standardPrice": "1200", "referencePrice": None}}}
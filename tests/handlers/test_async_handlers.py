@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import requests
+
+from handlers.async_handlers import AsyncItemHandler, AsyncCategoryHandler
+
+
+class FakeItemHandler:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_item(self, manage_number):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return {"manageNumber": manage_number}
+
+
+class FakeRMSClient:
+    """Serves items/search and items/bulk-get, tracking how many requests run at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, body):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = requests.compat.json.dumps(body).encode("utf-8")
+        return resp
+
+    def get(self, url, params=None):
+        return self._respond({"numFound": 1000, "results": [{"item": {}}] * params["hits"]})
+
+    def post(self, url, data=None):
+        manage_numbers = requests.compat.json.loads(data)["manageNumbers"]
+        return self._respond({"results": [{"manageNumber": m} for m in manage_numbers]})
+
+
+def test_async_item_handler_bounds_in_flight_requests():
+    handler = AsyncItemHandler("token", max_in_flight=3)
+    fake = FakeItemHandler()
+    handler.handler = fake
+
+    async def run():
+        return await asyncio.gather(*(handler.get_item(f"item-{i}") for i in range(12)))
+
+    results = asyncio.run(run())
+
+    assert [r["manageNumber"] for r in results] == [f"item-{i}" for i in range(12)]
+    assert fake.max_in_flight == 3
+
+
+def test_async_handlers_can_share_one_limit():
+    semaphore = asyncio.Semaphore(2)
+    item_handler = AsyncItemHandler("token", semaphore=semaphore)
+    category_handler = AsyncCategoryHandler("token", semaphore=semaphore)
+
+    assert item_handler.semaphore is category_handler.semaphore
+
+
+def test_async_item_handler_bounds_paged_requests():
+    client = FakeRMSClient()
+    handler = AsyncItemHandler("token", client=client, max_in_flight=2)
+
+    async def run():
+        return await asyncio.gather(
+            handler.search_item({}, page_size=100, max_page=5),
+            handler.bulk_get_item([f"item-{i}" for i in range(200)]),
+        )
+
+    searched, fetched = asyncio.run(run())
+
+    assert len(searched) == 500
+    assert len(fetched) == 200
+    # 每個 semaphore slot 同時只有一個請求
+    assert client.max_in_flight == 2
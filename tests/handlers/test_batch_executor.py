@@ -0,0 +1,51 @@
+import requests
+
+from handlers.batch_executor import BatchWriteExecutor
+
+
+def make_http_error(status_code: int, text: str) -> requests.exceptions.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = text.encode("utf-8")
+    return requests.exceptions.HTTPError(response=resp)
+
+
+class FlakyWriter:
+    def __init__(self):
+        self.calls = {}
+
+    def patch_item(self, manage_number, payload):
+        self.calls[manage_number] = self.calls.get(manage_number, 0) + 1
+        if manage_number == "bad-request":
+            raise make_http_error(400, "invalid payload")
+        if manage_number == "flaky" and self.calls[manage_number] == 1:
+            raise requests.exceptions.ConnectionError("connection reset")
+        if manage_number == "down":
+            raise requests.exceptions.ConnectionError("connection refused")
+
+
+def test_batch_write_executor_reports_results():
+    writer = FlakyWriter()
+    executor = BatchWriteExecutor(writer.patch_item, max_workers=3, max_retries=2, retry_delay=0)
+    payloads = {mn: {"title": mn} for mn in ["ok-1", "ok-2", "flaky", "bad-request", "down"]}
+    streamed = []
+
+    report = executor.run(payloads, on_result=streamed.append)
+
+    assert sorted(report.successful) == ["flaky", "ok-1", "ok-2"]
+    assert report.failed == {"bad-request": "400 invalid payload", "down": "connection refused"}
+    assert report.total == 5
+    assert sorted(r.manage_number for r in streamed) == sorted(payloads)
+    # 4xx 不重試，連線錯誤最多重試 max_retries 次
+    assert writer.calls["bad-request"] == 1
+    assert writer.calls["flaky"] == 2
+    assert writer.calls["down"] == 3
+
+
+def test_batch_write_executor_accepts_iterators():
+    writer = FlakyWriter()
+    executor = BatchWriteExecutor(writer.patch_item, max_workers=2)
+
+    report = executor.run(((f"item-{i}", {}) for i in range(20)))
+
+    assert len(report.successful) == 20
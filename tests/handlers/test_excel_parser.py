@@ -0,0 +1,61 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from handlers.excel_parser import ProductExcelParser
+
+
+def make_copywriting_rows(n):
+    return [
+        ["「商品詳細介紹」<圖片含文字>"],
+        [f"{n}_01.jpg", None, "主圖說明​", "https://example.com/a"],
+        [f"{n}_02.PNG", None, "  第二張  "],
+        [f"{n}_03.jpg", None, None, "https://example.com/c"],
+        [None],
+        ["「商品詳細介紹」<圖片無文字>"],
+        [None, None, "第一段說明"],
+        [None, None, None],
+        [None, None, "第二段說明 "],
+        ["「商品簡短介紹」<一段100字以內文字>", None, "標題列的內容不收集"],
+        [None, None, f"商品 {n} 簡短介紹"],
+        ["「商品5大賣點」<每項一段文字即可>"],
+        ["1", None, "賣點一"],
+        ["2", None, "賣點二"],
+        ["「商品詳細資訊」"],
+        ["詳細規格", None, "S / M / L"],
+        ["詳細規格", None, "XL"],
+        ["容量\n(ml)", None, 350, "備註"],
+        ["材質", None, "棉 100%"],
+        [None, None, "沒有欄位名"],
+    ]
+
+
+def make_workbook_bytes():
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    sheets = {
+        "商品1文案": make_copywriting_rows(1),
+        "目錄": [["不解析的工作表", None, "x"]],
+        "商品2文案": make_copywriting_rows(2)[::-1],    # 標題順序打亂也要一致
+        "商品3文案": [["「商品簡短介紹」<一段100字以內文字>"], [None, "只有兩欄"]],
+        "文案4": make_copywriting_rows(4)[:9],
+    }
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_streaming_reader_matches_pandas_reader():
+    excel_bytes = make_workbook_bytes()
+
+    expected = ProductExcelParser("shop-abc", excel_bytes).parse_all_sheets()
+    actual = ProductExcelParser("shop-abc", excel_bytes, streaming=True).parse_all_sheets()
+
+    assert [product["sequence"] for product in actual] == ["1", "2", "4"]
+    assert actual[0]["image_infos"][0]["description"] == "主圖說明"
+    assert actual[0]["product_info"]["仕様"] == "S / M / L\nXL"
+    assert actual == expected
@@ -0,0 +1,100 @@
+import pytest
+import requests
+
+from handlers.item_handler import BulkGetError, ItemHandler
+from models.item import ProductData
+
+
+class FakeSearchClient:
+    """Serves items/search pages for a catalog of `total` items."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.offsets = []
+
+    def get(self, url, params=None):
+        self.offsets.append(params["offset"])
+        end = min(params["offset"] + params["hits"], self.total)
+        body = {
+            "numFound": self.total,
+            "results": [{"item": {"manageNumber": f"item-{i}", "title": f"title-{i}"}}
+                        for i in range(params["offset"], end)],
+        }
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = requests.compat.json.dumps(body).encode("utf-8")
+        return resp
+
+
+def test_search_item_returns_pages_in_order():
+    client = FakeSearchClient(total=250)
+    item_handler = ItemHandler("token", client=client)
+
+    items = item_handler.search_item({"isHiddenItem": "false"}, page_size=100, max_page=10)
+
+    assert [i["item"]["manageNumber"] for i in items] == [f"item-{n}" for n in range(250)]
+    assert sorted(client.offsets) == [0, 100, 200]
+
+
+def test_search_item_respects_max_page():
+    client = FakeSearchClient(total=1000)
+    item_handler = ItemHandler("token", client=client)
+
+    items = item_handler.search_item({}, page_size=100, max_page=3)
+
+    assert len(items) == 300
+
+
+def test_iter_search_products_is_lazy():
+    client = FakeSearchClient(total=250)
+    item_handler = ItemHandler("token", client=client)
+
+    products = item_handler.iter_search_products({}, page_size=100, max_page=10, max_workers=1)
+    first = next(products)
+
+    assert isinstance(first, ProductData)
+    assert first.manage_number == "item-0"
+    assert client.offsets == [0]
+    assert len(list(products)) == 249
+
+
+class FakeBulkGetClient:
+    """Serves items/bulk-get, failing every chunk that contains a manage number in `failing`."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    def post(self, url, data=None):
+        manage_numbers = requests.compat.json.loads(data)["manageNumbers"]
+        resp = requests.Response()
+        resp.url = url
+        if self.failing.intersection(manage_numbers):
+            resp.status_code = 500
+            resp._content = b"server error"
+        else:
+            resp.status_code = 200
+            body = {"results": [{"manageNumber": m} for m in manage_numbers]}
+            resp._content = requests.compat.json.dumps(body).encode("utf-8")
+        return resp
+
+
+def test_bulk_get_item_reports_failed_chunks():
+    manage_numbers = [f"item-{i}" for i in range(120)]
+    item_handler = ItemHandler("token", client=FakeBulkGetClient(failing={"item-60"}))
+
+    results, failures = item_handler.bulk_get_item_with_failures(manage_numbers, chunk_size=50)
+
+    assert [r["manageNumber"] for r in results] == manage_numbers[:50] + manage_numbers[100:]
+    assert list(failures) == manage_numbers[50:100]
+    assert failures["item-60"].startswith("500")
+
+
+def test_bulk_get_item_raises_when_a_chunk_fails():
+    manage_numbers = [f"item-{i}" for i in range(120)]
+    item_handler = ItemHandler("token", client=FakeBulkGetClient(failing={"item-60"}))
+
+    with pytest.raises(BulkGetError) as exc_info:
+        item_handler.bulk_get_item(manage_numbers)
+
+    assert list(exc_info.value.failures) == manage_numbers[50:100]
+    assert len(ItemHandler("token", client=FakeBulkGetClient()).bulk_get_item(manage_numbers)) == 120
@@ -0,0 +1,79 @@
+from handlers.item_store import ItemStore
+
+
+class FakeItemHandler:
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def iter_search_pages(self, params, page_size=100, max_page=10):
+        self.calls.append(params["updatedFrom"])
+        updated = [{"item": item} for item in self.items if item["updated"] >= params["updatedFrom"]]
+        if params.get("sortKey") == "updated":
+            updated.sort(key=lambda result: result["item"]["updated"])
+        for i in range(0, min(len(updated), page_size * max_page), page_size):
+            yield updated[i:i + page_size]
+
+
+def make_item(manage_number, updated, title="title"):
+    return {"manageNumber": manage_number, "updated": updated, "title": title}
+
+
+def test_sync_only_pulls_items_after_watermark(tmp_path):
+    store = ItemStore(tmp_path / "items.sqlite3")
+    handler = FakeItemHandler([
+        make_item("a", "2025-01-02T10:00:00+09:00"),
+        make_item("b", "2025-01-03T10:00:00+09:00"),
+    ])
+
+    assert store.sync(handler, default_since="2025-01-01") == 2
+    assert store.get_watermark() == "2025-01-03T10:00:00+09:00"
+
+    handler.items.append(make_item("a", "2025-01-04T10:00:00+09:00", title="new title"))
+    handler.items.pop(0)
+
+    assert store.sync(handler, default_since="2025-01-01") == 2
+    assert handler.calls == ["2025-01-01", "2025-01-03T10:00:00+09:00"]
+    assert len(store) == 2
+
+    products = {p.manage_number: p for p in store.iter_products()}
+    assert products["a"].title == "new title"
+    assert [p.manage_number for p in store.iter_products(["b", "missing"])] == ["b"]
+
+
+def test_sync_continues_from_latest_updated_when_fetch_is_truncated(tmp_path):
+    store = ItemStore(tmp_path / "items.sqlite3")
+    handler = FakeItemHandler([
+        make_item("c", "2025-01-05T10:00:00+09:00"),
+        make_item("b", "2025-01-04T10:00:00+09:00"),
+        make_item("a", "2025-01-02T10:00:00+09:00"),
+    ])
+
+    store.sync(handler, default_since="2025-01-01", page_size=1, max_page=2)
+
+    assert handler.calls == ["2025-01-01", "2025-01-04T10:00:00+09:00", "2025-01-05T10:00:00+09:00"]
+    assert sorted(p.manage_number for p in store.iter_products()) == ["a", "b", "c"]
+    assert store.get_watermark() == "2025-01-05T10:00:00+09:00"
+
+
+def test_sync_warns_when_items_at_one_timestamp_exceed_the_limit(tmp_path):
+    warnings = []
+    store = ItemStore(tmp_path / "items.sqlite3", logger=warnings.append)
+    handler = FakeItemHandler([make_item(name, "2025-01-02T10:00:00+09:00") for name in "abc"])
+
+    store.sync(handler, default_since="2025-01-01", page_size=1, max_page=2)
+
+    assert len(store) == 2
+    assert store.get_watermark() == "2025-01-02T10:00:00+09:00"
+    assert len(warnings) == 1
+    assert "not synced" in warnings[0]
+
+
+def test_clear_resets_watermark(tmp_path):
+    store = ItemStore(tmp_path / "items.sqlite3")
+    store.sync(FakeItemHandler([make_item("a", "2025-01-02T10:00:00+09:00")]), default_since="2025-01-01")
+
+    store.clear()
+
+    assert len(store) == 0
+    assert store.get_watermark() is None
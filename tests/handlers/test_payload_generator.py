@@ -2,7 +2,9 @@ import json
 from pathlib import Path
 import pytest
 
-from handlers.payload_generator import TitleGenerator, HtmlGenerator, PointCampaignGenerator
+from handlers.payload_generator import (
+    BaseContentGenerator, CampaignPayloadGenerator, CompiledFormat, TitleGenerator, HtmlGenerator, PointCampaignGenerator
+)
 from models.item import ProductData, ProductDescription
 
 
@@ -83,3 +85,56 @@ def test_point_campaign_generator(test_case):
 
     # 3. Assert
     assert actual_output == expected_output
+
+
+@pytest.mark.parametrize("format_string, content, kwargs, expected", [
+    ("【SALE】{original_title} P{point_rate}倍", "商品", {"point_rate": 10}, "【SALE】商品 P10倍"),
+    ("【SALE】{original_title} P{point_rate}倍", "【SALE】商品 P10倍", {"point_rate": 10}, "【SALE】商品 P10倍"),
+    ("【SALE】{original_title} P{point_rate}倍", "【SALE】商品 P10倍", {"point_rate": 5}, "【SALE】【SALE】商品 P10倍 P5倍"),
+    ("【SALE】 P{point_rate}倍", "商品", {"point_rate": 10}, "【SALE】 P10倍"),
+    ("{{{original_title}}}", "商品", {}, "{商品}"),
+    ("{original_title}/{original_title}", "商品", {}, "商品/商品"),
+    ("[{original_title}] {codes}", "商品", {"codes": ["A", "B"]}, "[商品] ['A', 'B']"),
+])
+def test_apply_format_if_needed(format_string, content, kwargs, expected):
+    actual = BaseContentGenerator._apply_format_if_needed(
+        original_content=content, format_string=format_string, placeholder="{original_title}", **kwargs
+    )
+
+    assert actual == expected
+
+
+def test_generate_batch_matches_generate_and_shares_frames():
+    generator = CampaignPayloadGenerator(
+        title_format="【SALE】{original_title} ポイント{point_rate}倍",
+        html_format="<div>{original_html}</div>",
+        start_time="2025-12-04T20:00:00+09:00",
+        end_time="2025-12-11T01:59:59+09:00",
+        max_width=40,
+    )
+    products = [
+        ProductData(manage_number=f"item-{i}", title=f"商品 {i} " + "とても長い説明 " * i,
+                    product_description=ProductDescription(sp=f"<p>{i}</p>"), sales_description="")
+        for i in range(10)
+    ]
+    item_kwargs = [{"point_rate": (5, 10)[i % 2]} for i in range(10)]
+
+    payloads = generator.generate_batch(products, item_kwargs)
+
+    assert payloads == [CampaignPayloadGenerator(
+        title_format=generator.title_generator.title_format,
+        html_format=generator.html_generator.html_format,
+        start_time="2025-12-04T20:00:00+09:00",
+        end_time="2025-12-11T01:59:59+09:00",
+        max_width=40,
+    ).generate(product, **kwargs) for product, kwargs in zip(products, item_kwargs)]
+    assert len(generator.title_generator._frame_widths) == 2
+
+
+def test_title_frame_width_cache_is_bounded():
+    generator = TitleGenerator(title_format="{original_title} ポイント{point_rate}倍")
+
+    for point_rate in range(CompiledFormat._MAX_CACHED_FRAMES * 2):
+        generator._frame_width(point_rate=point_rate)
+
+    assert len(generator._frame_widths) <= CompiledFormat._MAX_CACHED_FRAMES
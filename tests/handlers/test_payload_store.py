@@ -0,0 +1,98 @@
+import os
+import time
+
+from handlers.payload_store import JsonlPayloadStore
+
+
+def make_payloads(count):
+    return [(f"item-{i}", {"title": f"標題 {i}", "pointCampaign": {"benefits": {"pointRate": i}}})
+            for i in range(count)]
+
+
+def test_payload_store_reads_pages_and_items(tmp_path):
+    store = JsonlPayloadStore(tmp_path / "payloads.jsonl")
+    assert not store
+
+    assert store.write_all(iter(make_payloads(45))) == 45
+    store.write("item-45", {"title": "最後"})
+
+    assert len(store) == 46
+    assert list(store.read_page(20, 20)) == [f"item-{i}" for i in range(20, 40)]
+    assert store.read_page(40, 20)["item-45"] == {"title": "最後"}
+    assert store.read_page(60, 20) == {}
+    assert list(store.iter_items())[:45] == make_payloads(45)
+
+
+def test_payload_store_reloads_and_drops_truncated_line(tmp_path):
+    path = tmp_path / "payloads.jsonl"
+    JsonlPayloadStore(path).write_all(make_payloads(3))
+    with open(path, "ab") as f:
+        f.write(b'{"manageNumber": "item-3", "pay')  # 寫到一半中斷
+
+    store = JsonlPayloadStore(path)
+    assert len(store) == 3
+    store.write("item-3", {"title": "重寫"})
+
+    assert dict(JsonlPayloadStore(path).iter_items())["item-3"] == {"title": "重寫"}
+    assert len(JsonlPayloadStore(path)) == 4
+
+
+def test_payload_store_clear(tmp_path):
+    store = JsonlPayloadStore(tmp_path / "payloads.jsonl")
+    store.write_all(make_payloads(2))
+
+    store.clear()
+
+    assert len(store) == 0
+    assert not store.path.exists()
+    assert list(store.iter_items()) == []
+
+
+def test_remove_stale_files_keeps_recent_stores(tmp_path):
+    stale = JsonlPayloadStore(tmp_path / "stale.jsonl")
+    stale.write("item-1", {"title": "舊"})
+    old_time = time.time() - JsonlPayloadStore.STALE_AFTER_SECONDS - 60
+    os.utime(stale.path, (old_time, old_time))
+    recent = JsonlPayloadStore(tmp_path / "recent.jsonl")
+    recent.write("item-1", {"title": "新"})
+
+    assert JsonlPayloadStore.remove_stale_files(tmp_path) == 1
+
+    assert not stale.path.exists()
+    assert recent.path.exists()
+
+
+def test_reading_a_store_keeps_it_from_being_removed(tmp_path):
+    store = JsonlPayloadStore(tmp_path / "idle.jsonl")
+    store.write_all(make_payloads(3))
+    old_time = time.time() - JsonlPayloadStore.STALE_AFTER_SECONDS - 60
+    os.utime(store.path, (old_time, old_time))
+
+    assert list(store.read_page(0, 2)) == ["item-0", "item-1"]
+
+    assert JsonlPayloadStore.remove_stale_files(tmp_path) == 0
+    assert store.path.exists()
+
+
+def test_store_whose_file_was_removed_reads_as_empty(tmp_path):
+    store = JsonlPayloadStore(tmp_path / "removed.jsonl")
+    store.write_all(make_payloads(3))
+    store.path.unlink()  # 其他 session 清除過期檔
+
+    assert store.read_page(0, 2) == {}
+    assert list(store.iter_items()) == []
+    assert len(store) == 0
+
+    store.write("item-9", {"title": "新"})
+    assert list(store.iter_items()) == [("item-9", {"title": "新"})]
+
+
+def test_write_after_file_was_removed_starts_a_new_file(tmp_path):
+    store = JsonlPayloadStore(tmp_path / "removed.jsonl")
+    store.write_all(make_payloads(3))
+    store.path.unlink()
+
+    store.write("item-9", {"title": "新"})
+
+    assert len(store) == 1
+    assert list(JsonlPayloadStore(store.path).iter_items()) == [("item-9", {"title": "新"})]
@@ -0,0 +1,96 @@
+import math
+
+import pandas as pd
+import pytest
+
+from handlers.price_rules import PriceRuleEngine, PriceRuleSet, build_patch_payloads, variants_to_frame
+
+
+def make_items():
+    return [
+        {"manageNumber": "item-1", "variants": {
+            "a": {"standardPrice": "1000"},
+            "b": {"standardPrice": "900", "referencePrice": {"value": "1999"}},
+            "c": {"standardPrice": "1234", "referencePrice": {"value": ""}},
+        }},
+        {"manageNumber": "item-2", "variants": {
+            "a": {"standardPrice": None},
+            "b": {"standardPrice": "abc"},
+            "c": {"standardPrice": "3333"},
+        }},
+    ]
+
+
+def prices(preview):
+    new_prices = preview.set_index(["manage_number", "variant_id"])["new_price"]
+    return {key: None if price is pd.NA else int(price) for key, price in new_prices.items()}
+
+
+def test_global_discount_matches_math_floor():
+    items = [{"manageNumber": f"item-{i}", "variants": {"v": {"standardPrice": str(p)}}}
+             for i, p in enumerate(range(100, 5000, 7))]
+
+    payloads = build_patch_payloads(PriceRuleEngine(PriceRuleSet(discount=0.7)).apply(variants_to_frame(items)))
+
+    for item in items:
+        original = int(item["variants"]["v"]["standardPrice"])
+        assert payloads[item["manageNumber"]] == {"variants": {"v": {
+            "standardPrice": str(math.floor(original * 0.7)),
+            "referencePrice": {"displayType": "REFERENCE_PRICE", "type": 1, "value": str(original)},
+        }}}
+
+
+def test_rules_apply_overrides_rounding_and_bounds():
+    rules = PriceRuleSet(
+        discount=0.8,
+        item_discounts={"item-2": 0.5},
+        sku_discounts={"item-1": {"b": 0.9}},
+        round_to=10,
+        rounding="nearest",
+        min_price=700,
+        max_price=1500,
+    )
+
+    preview = PriceRuleEngine(rules).apply(variants_to_frame(make_items()))
+
+    assert prices(preview) == {
+        ("item-1", "a"): 800,     # 1000 * 0.8
+        ("item-1", "b"): 1500,    # 1999 * 0.9 = 1799.1 -> max_price
+        ("item-1", "c"): 990,     # 空的 referencePrice 改用 standardPrice：1234 * 0.8 = 987.2 -> 990
+        ("item-2", "a"): None,
+        ("item-2", "b"): None,
+        ("item-2", "c"): 1500,    # 3333 * 0.5 = 1666.5 -> 1670 -> max_price
+    }
+    assert list(preview["skip_reason"].iloc[3:5]) == ["Could not determine original price", "Invalid price"]
+
+    payloads = build_patch_payloads(preview)
+    assert list(payloads["item-2"]["variants"]) == ["c"]
+
+
+def test_min_price_ratio_limits_discount():
+    rules = PriceRuleSet(discount=0.3, min_price_ratio=0.5, round_to=10)
+
+    preview = PriceRuleEngine(rules).apply(variants_to_frame(make_items()))
+
+    assert prices(preview)[("item-1", "a")] == 500
+    assert prices(preview)[("item-2", "c")] == 1670    # ceil(3333 * 0.5 / 10) * 10
+
+
+def test_min_price_at_or_above_original_skips_sku():
+    rules = PriceRuleSet(discount=0.5, min_price=1000)
+
+    preview = PriceRuleEngine(rules).apply(variants_to_frame(make_items()))
+
+    assert prices(preview)[("item-1", "a")] is None    # 500 -> 1000，不低於原價 1000
+    assert prices(preview)[("item-1", "b")] == 1000     # 999 -> 1000，仍低於原價 1999
+    assert prices(preview)[("item-2", "c")] == 1666
+    skip_reasons = preview.set_index(["manage_number", "variant_id"])["skip_reason"]
+    assert skip_reasons[("item-1", "a")] == "Minimum price is not below the original price"
+    assert "a" not in build_patch_payloads(preview)["item-1"]["variants"]
+
+
+def test_invalid_discount_is_rejected():
+    with pytest.raises(ValueError):
+        PriceRuleSet(discount=1.5)
+    with pytest.raises(ValueError):
+        PriceRuleSet(item_discounts={"item-1": 0})
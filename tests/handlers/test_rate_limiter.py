@@ -0,0 +1,86 @@
+import time
+
+import requests
+
+from handlers.rate_limiter import RateLimiter, TokenBucket, backoff_delay, parse_retry_after
+from handlers.rms_client import RMSClient
+
+
+def make_response(status_code: int, headers: dict = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers.update(headers or {})
+    return resp
+
+
+class FakeSession(requests.Session):
+    """Returns the queued status codes in order instead of sending requests."""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        return make_response(*self.statuses.pop(0))
+
+
+def test_endpoint_key():
+    assert RateLimiter.endpoint_key(
+        "https://api.rms.rakuten.co.jp/es/2.0/items/manage-numbers/abc") == "items/manage-numbers"
+    assert RateLimiter.endpoint_key(
+        "https://api.rms.rakuten.co.jp/es/2.1/inventories/bulk-get") == "inventories/bulk-get"
+
+
+def test_rate_limiter_uses_endpoint_then_api_budget():
+    limiter = RateLimiter(default_rate=5, budgets={"items/search": 1, "inventories": 2})
+
+    assert limiter._bucket_for("items/search").rate == 1
+    assert limiter._bucket_for("inventories/bulk-get").rate == 2
+    assert limiter._bucket_for("items/bulk-get").rate == 5
+
+
+def test_token_bucket_throttles_after_burst():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # 1 個立即取得，其餘 4 個每個約 50ms
+    assert time.monotonic() - start >= 0.18
+
+
+def test_backoff_delay_prefers_retry_after():
+    assert parse_retry_after(make_response(429, {"Retry-After": "3"})) == 3
+    assert backoff_delay(0, make_response(429, {"Retry-After": "2"})) == 2
+    # 過大的 Retry-After 不會讓 worker 等太久
+    assert backoff_delay(0, make_response(429, {"Retry-After": "86400"}), max_delay=30) == 30
+
+    for attempt in range(5):
+        delay = backoff_delay(attempt, make_response(503), base_delay=1, max_delay=8)
+        cap = min(8, 2 ** attempt)
+        assert cap / 2 <= delay <= cap
+
+
+def test_client_retries_throttled_requests(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    session = FakeSession([(429, {"Retry-After": "0"}), (503,), (200,)])
+    logs = []
+    client = RMSClient("token", session=session, rate_limiter=RateLimiter(1000), max_retries=4, logger=logs.append)
+
+    resp = client.get("https://api.rms.rakuten.co.jp/es/2.0/items/manage-numbers/abc")
+
+    assert resp.status_code == 200
+    assert session.calls == 3
+    assert len(logs) == 2 and logs[0].startswith("RMS returned 429")
+
+
+def test_client_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    session = FakeSession([(500,), (500,), (500,)])
+    client = RMSClient("token", session=session, rate_limiter=RateLimiter(1000), max_retries=2)
+
+    resp = client.get("https://api.rms.rakuten.co.jp/es/2.0/items/manage-numbers/abc")
+
+    assert resp.status_code == 500
+    assert session.calls == 3
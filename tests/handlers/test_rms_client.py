@@ -0,0 +1,24 @@
+from handlers.category_handler import CategoryHandler
+from handlers.inventory_handler import InventoryHandler
+from handlers.item_handler import ItemHandler
+from handlers.rms_client import RMSClient, get_default_client
+
+
+def test_handlers_share_default_client():
+    item_handler = ItemHandler("token-a")
+    inventory_handler = InventoryHandler("token-a")
+    category_handler = CategoryHandler("token-a")
+
+    assert item_handler.client is get_default_client("token-a")
+    assert inventory_handler.client is item_handler.client
+    assert category_handler.client is item_handler.client
+    assert ItemHandler("token-b").client is not item_handler.client
+
+
+def test_client_builds_auth_headers_once():
+    client = RMSClient("token", timeout=5)
+
+    assert client.session.headers["Authorization"] == "Bearer token"
+    assert client.session.headers["Content-Type"] == "application/json"
+    assert client.timeout == 5
+    assert ItemHandler("token", client=client).client is client
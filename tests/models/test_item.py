@@ -0,0 +1,54 @@
+import pytest
+from pydantic import ValidationError
+
+from models.item import CampaignProductData, ProductData
+
+
+def make_api_item(manage_number="item-1", **overrides):
+    item = {
+        "manageNumber": manage_number,
+        "itemNumber": "no-1",
+        "title": "【送料無料】テスト商品",
+        "productDescription": {"pc": "<p>pc</p>", "sp": "<p>sp</p>"},
+        "images": [{"type": "CABINET", "location": "/a.jpg", "alt": "a"}],
+        "tags": [1001, 1002],
+        "variants": {"v1": {"standardPrice": "1200",
+                            "referencePrice": {"displayType": "REFERENCE_PRICE", "type": 1, "value": "1999"}}},
+        "customizationOptions": [{"displayName": "包裝", "inputType": "SINGLE_SELECTION",
+                                  "selections": [{"displayValue": "有"}, {"displayValue": "無"}]}],
+        "pointCampaign": {"applicablePeriod": {"start": "2025-10-24T20:00:00+09:00",
+                                               "end": "2025-10-27T09:59:59+09:00"},
+                          "benefits": {"pointRate": 5}},
+        "hideItem": False,
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.mark.parametrize("item", [
+    make_api_item(),
+    make_api_item(productDescription=None, descriptionForPC="pc", descriptionForSmartPhone="sp"),
+    {k: v for k, v in make_api_item(salesDescription="sales", hideItem=True).items() if k != "pointCampaign"},
+    {"manageNumber": "minimal"},
+])
+def test_campaign_product_data_matches_full_parse(item):
+    expected = ProductData.from_api(item)
+
+    product = CampaignProductData.from_api(item)
+
+    assert product.model_dump() == expected.model_dump(include=set(CampaignProductData.model_fields))
+    assert product.api_sales_description == expected.api_sales_description
+    assert product.model_fields_set == set(CampaignProductData.model_fields)
+
+
+def test_campaign_product_data_validates_on_parse():
+    with pytest.raises(ValidationError):
+        CampaignProductData.from_api(make_api_item(pointCampaign={"benefits": {"pointRate": "many"}}))
+
+
+def test_from_api_runs_model_validators():
+    item = make_api_item(variants={"v1": {"standardPrice": "1200",
+                                          "referencePrice": {"displayType": "REFERENCE_PRICE"}}})
+
+    with pytest.raises(ValidationError, match="type is required"):
+        ProductData.from_api(item)
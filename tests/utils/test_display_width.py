@@ -0,0 +1,40 @@
+import random
+import unicodedata
+
+from utils.display_width import get_display_width, get_display_widths
+
+
+def reference_display_width(text: str) -> int:
+    width = 0
+    for char in text:
+        if unicodedata.east_asian_width(char) in ('F', 'W', 'A'):
+            width += 2
+        else:
+            width += 1
+    return width
+
+
+def make_texts(count: int):
+    rng = random.Random(0)
+    ranges = [(0x20, 0x7e), (0x80, 0x24ff), (0x3040, 0x30ff), (0x4e00, 0x9fff), (0xd800, 0xdfff),
+              (0xe000, 0xffff), (0x10000, 0x10ffff), (0x1f300, 0x1f6ff), (0x20000, 0x2a6df)]
+    return [
+        "".join(chr(rng.randint(*rng.choice(ranges))) for _ in range(rng.randint(0, 30)))
+        for _ in range(count)
+    ]
+
+
+def test_display_width_matches_east_asian_width_for_every_bmp_char():
+    for codepoint in range(0x10000):
+        char = chr(codepoint)
+        assert get_display_width(char) == reference_display_width(char), hex(codepoint)
+
+
+def test_display_width_matches_reference_for_mixed_texts():
+    texts = make_texts(2000) + ["", "ABC", "【SALE】送料無料 Tシャツ", "絵文字🎉と𠮷野家"]
+
+    expected = [reference_display_width(text) for text in texts]
+
+    assert [get_display_width(text) for text in texts] == expected
+    assert get_display_widths(texts) == expected
+    assert get_display_widths([]) == []
@@ -0,0 +1,37 @@
+from utils.step_journal import StepJournal
+
+
+def test_step_journal_survives_reload_and_partial_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = StepJournal(path)
+    journal.record("item-1", "get_category", {"categoryIds": ["a"]})
+    journal.record("item-1", "create_item")
+
+    # 模擬寫到一半中斷的最後一行
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"manage_number": "item-1", "step": "inven')
+
+    reloaded = StepJournal(path)
+
+    assert reloaded.is_done("item-1", "create_item")
+    assert reloaded.get_result("item-1", "get_category") == {"categoryIds": ["a"]}
+    assert not reloaded.is_done("item-1", "inventory")
+    assert reloaded.completed_steps() == {
+        ("item-1", "get_category"): {"categoryIds": ["a"]},
+        ("item-1", "create_item"): None,
+    }
+
+    reloaded.reset()
+    assert not path.exists()
+    assert not reloaded.completed_steps()
+
+
+def test_step_journal_record_after_partial_line_is_kept(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    StepJournal(path).record("a", "create_item")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"manage_number": "a", "step": "inven')
+
+    StepJournal(path).record("b", "create_item")
+
+    assert StepJournal(path).completed_steps() == {("a", "create_item"): None, ("b", "create_item"): None}
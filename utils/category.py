@@ -1,17 +1,13 @@
-import requests
-
 from env_settings import EnvSettings
+from handlers.rms_client import get_default_client
 
 env_settings = EnvSettings()
 
 
 def update_category_layout():
-    headers = {
-        "Authorization": f"Bearer {env_settings.auth_token}",
-        "Content-Type": "application/json"
-    }
+    client = get_default_client(env_settings.auth_token)
     tree_url = "https://api.rms.rakuten.co.jp/es/2.0/categories/shop-category-trees/category-set-ids/0"
-    resp = requests.get(tree_url, headers=headers)
+    resp = client.get(tree_url)
 
     categories = resp.json().get("rootNode").get("children")
     root_category_ids = [category.get("categoryId") for category in categories]
@@ -19,7 +15,7 @@ def update_category_layout():
 
     detail_url = "https://api.rms.rakuten.co.jp/es/2.0/categories/shop-categories/category-ids/{uuid}"
     for i in root_category_ids:
-        resp = requests.get(detail_url.format(uuid=i), headers=headers)
+        resp = client.get(detail_url.format(uuid=i))
         resp.raise_for_status()
 
         if "◆" in resp.json().get("title"):
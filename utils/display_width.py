@@ -0,0 +1,71 @@
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+# 以半形為 1、全形為 2 計算顯示寬度；East Asian Width 為 F (Fullwidth), W (Wide), A (Ambiguous) 的字元算 2
+WIDE_EAST_ASIAN_WIDTHS = ('F', 'W', 'A')
+
+_BMP_SIZE = 0x10000
+_WIDE_MARK = "\x02"
+
+
+def _char_width(char: str) -> int:
+    return 2 if unicodedata.east_asian_width(char) in WIDE_EAST_ASIAN_WIDTHS else 1
+
+
+@lru_cache(maxsize=1)
+def bmp_width_table() -> bytearray:
+    """BMP 每個 codepoint 的顯示寬度（1 或 2），第一次使用時建立。"""
+    return bytearray(_char_width(chr(codepoint)) for codepoint in range(_BMP_SIZE))
+
+
+@lru_cache(maxsize=1)
+def _translate_table() -> str:
+    """
+    str.translate 用的查表：BMP 字元依寬度換成 "\\x01" 或 "\\x02"。
+    BMP 以外的字元不在表內，translate 後保持原樣。
+    """
+    return bytes(bmp_width_table()).decode("latin-1")
+
+
+def _marked_width(marked: str) -> int:
+    """translate 後的字串中，寬度 2 的字元比寬度 1 多出的寬度總和。"""
+    extra = marked.count(_WIDE_MARK)
+    if not marked.isascii():
+        # 只剩 BMP 以外的字元不是 ASCII，逐一判斷
+        extra += sum(_char_width(char) - 1 for char in marked if char >= "\U00010000")
+    return extra
+
+
+def get_display_width(text: str) -> int:
+    """
+    字串的顯示寬度。ASCII 直接回傳長度，其他字串以查表一次轉換後計算寬字元數。
+    """
+    if text.isascii():
+        return len(text)
+    return len(text) + _marked_width(text.translate(_translate_table()))
+
+
+def get_display_widths(texts: List[str]) -> List[int]:
+    """
+    一次計算多個字串的顯示寬度，結果與逐一呼叫 get_display_width 相同。
+    所有字串合併後只做一次 translate，適合大量短字串（例如標題中的每個單字）。
+    """
+    joined = "".join(texts)
+    if joined.isascii():
+        return [len(text) for text in texts]
+
+    marked = joined.translate(_translate_table())
+    if not marked.isascii():
+        # 含有 BMP 以外的字元時逐一計算
+        return [get_display_width(text) for text in texts]
+
+    # translate 不改變長度，依原字串長度計算每一段中的寬字元數
+    widths = []
+    count_wide = marked.count
+    start = 0
+    for text in texts:
+        end = start + len(text)
+        widths.append(len(text) + count_wide(_WIDE_MARK, start, end))
+        start = end
+    return widths
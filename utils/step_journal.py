@@ -0,0 +1,74 @@
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Hashable, Tuple
+
+from env_settings import EnvSettings
+
+env_settings = EnvSettings()
+
+
+class StepJournal:
+    """
+    Append-only JSONL record of the steps each item has completed in a flow run.
+    One line per completed step: {"manage_number", "step", "result", "recorded_at"}.
+    A resumed run reads the file back, skips every recorded step and reuses its result.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Any] = {}
+        self._load()
+
+    @classmethod
+    def for_run(cls, run_name: str) -> "StepJournal":
+        return cls(env_settings.output_dir / "journals" / f"{run_name}.jsonl")
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        size = 0
+        with open(self.path, "r+b") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 中斷時寫了一半的最後一行：截掉，否則下一筆 record 會接在這行後面而無法解析
+                    f.truncate(size)
+                    break
+                size += len(line)
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._entries[(entry["manage_number"], entry["step"])] = entry.get("result")
+
+    def is_done(self, manage_number: str, step: str) -> bool:
+        return (manage_number, step) in self._entries
+
+    def get_result(self, manage_number: str, step: str) -> Any:
+        return self._entries.get((manage_number, step))
+
+    def completed_steps(self) -> Dict[Hashable, Any]:
+        """{(manage_number, step): result}，可直接作為 TaskGraphRunner.run 的 completed。"""
+        return dict(self._entries)
+
+    def record(self, manage_number: str, step: str, result: Any = None):
+        entry = {
+            "manage_number": manage_number,
+            "step": step,
+            "result": result,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+            self._entries[(manage_number, step)] = result
+
+    def reset(self):
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._entries.clear()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Tuple
 
 
 def parse_manage_numbers_input(input_string: str) -> List[str]:
@@ -20,3 +20,31 @@ def parse_manage_numbers_input(input_string: str) -> List[str]:
     # Use a set to remove duplicates and then convert back to a list
     return list(set([mn.strip() for mn in cleaned_string.split(',') if mn.strip()]))
 
+
+def parse_discount_overrides(input_string: str) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
+    """
+    Parses per-item / per-SKU discount overrides, one per line:
+    "manage_number,discount" or "manage_number,variant_id,discount".
+
+    Returns:
+        (item_discounts, sku_discounts) ready for PriceRuleSet.
+
+    Raises:
+        ValueError: If a line has the wrong number of fields or a non-numeric discount.
+    """
+    item_discounts: Dict[str, float] = {}
+    sku_discounts: Dict[str, Dict[str, float]] = {}
+    for line_no, line in enumerate((input_string or "").splitlines(), start=1):
+        fields = [field.strip() for field in line.split(',')]
+        if not any(fields):
+            continue
+        try:
+            if len(fields) == 2:
+                item_discounts[fields[0]] = float(fields[1])
+            elif len(fields) == 3:
+                sku_discounts.setdefault(fields[0], {})[fields[1]] = float(fields[2])
+            else:
+                raise ValueError("expected 2 or 3 comma-separated fields")
+        except ValueError as e:
+            raise ValueError(f"Line {line_no} ({line.strip()}): {e}") from e
+    return item_discounts, sku_discounts
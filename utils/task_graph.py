@@ -0,0 +1,92 @@
+import heapq
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# key -> (func, deps)；func 會收到 deps 的執行結果（依 deps 順序）作為位置參數
+TaskSpec = Tuple[Callable[..., Any], Iterable[Hashable]]
+
+
+class TaskGraphResult:
+    def __init__(self, results: Dict[Hashable, Any], errors: Dict[Hashable, Exception], skipped: Set[Hashable]):
+        self.results = results
+        self.errors = errors
+        self.skipped = skipped
+
+
+class TaskGraphRunner:
+    """
+    Runs a dependency graph of small blocking tasks (typically one sub-graph per item)
+    on a shared thread pool. A task starts once every task it depends on has succeeded;
+    when a task fails, everything that depends on it is skipped.
+
+    Ready tasks are started in the order they were declared, so later steps of early items
+    take priority over first steps of later items and items finish one after another.
+    `on_done` is called on the caller's thread, so it can safely write to Streamlit.
+    Tasks listed in `completed` (e.g. from a StepJournal) are not run again; their
+    recorded results are handed to their dependents instead.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+
+    def run(
+            self,
+            tasks: Dict[Hashable, TaskSpec],
+            on_done: Optional[Callable[[Hashable, Any, Optional[Exception]], None]] = None,
+            completed: Optional[Dict[Hashable, Any]] = None,
+    ) -> TaskGraphResult:
+        completed = {key: result for key, result in (completed or {}).items() if key in tasks}
+        order = {key: i for i, key in enumerate(tasks)}
+        remaining_deps = {}
+        dependents = defaultdict(list)
+        for key, (_, deps) in tasks.items():
+            deps = list(deps)
+            for dep in deps:
+                if dep not in tasks:
+                    raise KeyError(f"Task {key} depends on unknown task {dep}")
+                dependents[dep].append(key)
+            remaining_deps[key] = {dep for dep in deps if dep not in completed}
+
+        results: Dict[Hashable, Any] = dict(completed)
+        errors: Dict[Hashable, Exception] = {}
+        skipped: Set[Hashable] = set()
+        ready = [(order[key], key) for key, deps in remaining_deps.items() if not deps and key not in completed]
+        heapq.heapify(ready)
+
+        def skip_dependents(failed_key):
+            stack = list(dependents[failed_key])
+            while stack:
+                key = stack.pop()
+                if key not in skipped:
+                    skipped.add(key)
+                    stack.extend(dependents[key])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    _, key = heapq.heappop(ready)
+                    func, deps = tasks[key]
+                    args = [results[dep] for dep in deps]
+                    running[executor.submit(func, *args)] = key
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        errors[key] = e
+                        skip_dependents(key)
+                    else:
+                        for dependent in dependents[key]:
+                            remaining_deps[dependent].discard(key)
+                            if (not remaining_deps[dependent] and dependent not in skipped
+                                    and dependent not in completed):
+                                heapq.heappush(ready, (order[dependent], dependent))
+
+                    if on_done:
+                        on_done(key, results.get(key), errors.get(key))
+
+        return TaskGraphResult(results, errors, skipped)